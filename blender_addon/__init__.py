@@ -19,9 +19,14 @@ bl_info = {
 import bpy
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging on the addon's own logger only; the root logger belongs to Blender
 logger = logging.getLogger("blender_metahuman_mcp")
+if not logger.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+    logger.addHandler(_log_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
 
 # Module-level references
 _tcp_server = None
@@ -92,14 +97,15 @@ def _build_command_router():
     router.register_many(get_scene_handlers())
     router.register_many(get_export_handlers())
 
-    # Register a ping/health-check command
-    router.register("ping", lambda params: {"status": "success", "result": "pong"})
+    # Register a ping/health-check command; neither touches bpy, so they
+    # are answered on the TCP thread without waiting for a timer tick
+    router.register("ping", lambda params: {"status": "success", "result": "pong"}, main_thread=False)
     router.register("list_commands", lambda params: {
         "status": "success",
         "result": router.list_commands()
-    })
+    }, main_thread=False)
 
-    logger.info(f"Command router ready with {len(router.list_commands())} commands")
+    logger.info("Command router ready with %d commands", len(router.list_commands()))
     return router
 
 
@@ -108,13 +114,15 @@ def start_server():
     global _tcp_server, _command_router
 
     from .tcp_server import MCPTCPServer
+    from .utils import scene_cache
     from .utils.thread_safe import command_queue
 
     if _tcp_server and _tcp_server._running:
         logger.warning("Server already running")
         return
 
-    _command_router = _build_command_router()
+    if _command_router is None:
+        _command_router = _build_command_router()
     command_queue.start_timer()
 
     _tcp_server = MCPTCPServer(
@@ -122,6 +130,7 @@ def start_server():
         port=9876,
         command_router=_command_router
     )
+    scene_cache.add_update_listener(_tcp_server.invalidate_response_cache)
     _tcp_server.start()
 
 
@@ -129,9 +138,11 @@ def stop_server():
     """Stop the TCP server and command queue timer."""
     global _tcp_server
 
+    from .utils import scene_cache
     from .utils.thread_safe import command_queue
 
     if _tcp_server:
+        scene_cache.remove_update_listener(_tcp_server.invalidate_response_cache)
         _tcp_server.stop()
         _tcp_server = None
 
@@ -147,15 +158,28 @@ classes = (
 
 
 def register():
+    global _command_router
+    from .utils import scene_cache
+
     for cls in classes:
         bpy.utils.register_class(cls)
+    scene_cache.register()
+    # Built once here so server restarts reuse the same router
+    _command_router = _build_command_router()
     logger.info("MCP MetaHuman addon registered")
     # Auto-start server on addon load
     bpy.app.timers.register(lambda: (start_server(), None)[-1], first_interval=1.0)
 
 
 def unregister():
+    global _command_router
+    from .handlers.export_handler import shutdown_post_executor
+    from .utils import scene_cache
+
     stop_server()
+    _command_router = None
+    shutdown_post_executor()
+    scene_cache.unregister()
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     logger.info("MCP MetaHuman addon unregistered")
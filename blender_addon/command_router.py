@@ -6,7 +6,7 @@ on Blender's main thread via the CommandQueue.
 """
 
 import logging
-from .utils.thread_safe import command_queue
+from .utils.thread_safe import command_queue, _execute
 
 logger = logging.getLogger("blender_metahuman_mcp.command_router")
 
@@ -16,16 +16,22 @@ class CommandRouter:
 
     def __init__(self):
         self._handlers = {}
+        self._direct = set()  # Commands that never touch bpy
 
-    def register(self, command_name, handler_func):
+    def register(self, command_name, handler_func, main_thread=True):
         """Register a handler function for a command name.
 
         Args:
             command_name: String command identifier (e.g., "move_bone").
             handler_func: Callable(params: dict) -> dict.
+            main_thread: False for handlers that don't use bpy; they run
+                         directly on the calling thread, skipping the queue.
         """
         self._handlers[command_name] = handler_func
-        logger.debug(f"Registered handler for '{command_name}'")
+        if main_thread:
+            self._direct.discard(command_name)
+        else:
+            self._direct.add(command_name)
 
     def register_many(self, handlers_dict):
         """Register multiple handlers at once.
@@ -36,28 +42,76 @@ class CommandRouter:
         for name, func in handlers_dict.items():
             self.register(name, func)
 
-    def dispatch(self, command_name, params):
-        """Dispatch a command to its handler, executing on Blender's main thread.
+    def is_direct(self, command_name):
+        """Whether the command is registered to run off the main thread (no bpy)."""
+        return command_name in self._direct
 
-        Args:
-            command_name: The command to execute.
-            params: Dict of parameters.
+    def _unknown_command(self, command_name):
+        """Error result for a command with no registered handler."""
+        available = ", ".join(sorted(self._handlers.keys()))
+        return {
+            "status": "error",
+            "error": f"Unknown command: '{command_name}'. Available: {available}"
+        }
+
+    def _route(self, command_name, params):
+        """Resolve a command to (result, handler).
 
-        Returns:
-            dict with 'status' and 'result' or 'error'.
+        Unknown and direct commands are answered at once (handler is None);
+        anything else returns the handler to queue for the main thread.
         """
         handler = self._handlers.get(command_name)
         if not handler:
-            available = ", ".join(sorted(self._handlers.keys()))
-            return {
-                "status": "error",
-                "error": f"Unknown command: '{command_name}'. Available: {available}"
-            }
-
-        # Submit to the command queue for main-thread execution
-        command_id = command_queue.submit_command(handler, params)
-        result = command_queue.get_result(command_id, timeout=15.0)
-        return result
+            return self._unknown_command(command_name), None
+        if command_name in self._direct:
+            return _execute(handler, params), None
+        return None, handler
+
+    def submit(self, command_name, params, callback):
+        """Queue a command without blocking; callback(result) fires on completion.
+
+        The callback runs on Blender's main thread (or immediately on the
+        calling thread for unknown and direct commands), so it must be
+        cheap and must not touch bpy.
+        """
+        result, handler = self._route(command_name, params)
+        if handler is None:
+            callback(result)
+            return
+        command_queue.submit_command(handler, params, callback=callback)
+
+    def submit_batch(self, commands, callback):
+        """Queue a batch without blocking; callback(results) fires on completion.
+
+        Every queued command runs back-to-back in a single timer tick, so
+        the batch pays one queue round-trip instead of one per command.
+
+        Args:
+            commands: List of (command_name, params) tuples.
+            callback: Callable receiving the list of result dicts, in order.
+        """
+        results = [None] * len(commands)
+        submitted = []
+        indices = []
+
+        for i, (command_name, params) in enumerate(commands):
+            result, handler = self._route(command_name, params)
+            if handler is None:
+                results[i] = result
+                continue
+            submitted.append((handler, params))
+            indices.append(i)
+
+        if not submitted:
+            callback(results)
+            return
+
+        def _merge(batch_results):
+            for i, result in zip(indices, batch_results):
+                results[i] = result
+            callback(results)
+
+        command_queue.submit_batch(submitted, callback=_merge)
 
     def list_commands(self):
         """Return a list of all registered command names."""
@@ -6,42 +6,146 @@ They manipulate pose bones on the active armature.
 """
 
 import bpy
+import re
 import math
+import fnmatch
 import logging
+from functools import lru_cache
+
+import numpy as np
+
+from ..utils import scene_cache
+from ..utils.thread_safe import command_queue
 
 logger = logging.getLogger("blender_metahuman_mcp.bone_handler")
 
+# First armature found by scanning the scene; cleared on structural changes
+_cached_armature = None
+
+# name -> pose index for _bone_map_owner; cleared on structural changes
+_bone_map_owner = None
+_cached_bone_index = {}
+
+
+@scene_cache.on_structure_change
+def _invalidate_armature_cache():
+    global _cached_armature, _bone_map_owner
+    _cached_armature = None
+    _bone_map_owner = None
+    _cached_bone_index.clear()
+
+
+def _is_in_scene(obj):
+    """Check that a cached object still exists and is linked to the current scene."""
+    try:
+        return bpy.context.scene.objects.get(obj.name) is obj
+    except ReferenceError:
+        return False
+
 
 def _get_armature():
     """Find the active armature or the first armature in the scene."""
+    global _cached_armature
+
     obj = bpy.context.active_object
     if obj and obj.type == "ARMATURE":
         return obj
 
+    if _cached_armature is not None and _is_in_scene(_cached_armature):
+        return _cached_armature
+
     # Search scene for an armature
+    _cached_armature = None
     for obj in bpy.context.scene.objects:
         if obj.type == "ARMATURE":
+            _cached_armature = obj
             return obj
 
     return None
 
 
 def _ensure_pose_mode(armature):
-    """Ensure the armature is selected and in pose mode."""
+    """Ensure the armature is selected and in pose mode.
+
+    Pose-bone transforms are writable from object mode too, so only
+    handlers that genuinely need pose mode call this.
+    """
+    if bpy.context.view_layer.objects.active is armature and bpy.context.mode == "POSE":
+        return
     bpy.context.view_layer.objects.active = armature
     armature.select_set(True)
     if bpy.context.mode != "POSE":
         bpy.ops.object.mode_set(mode="POSE")
 
 
+def _refresh_bone_map(armature, pose_bones, force=False):
+    """Rebuild the name -> index lookup when it belongs to another armature or is stale."""
+    global _bone_map_owner
+    if not force and _bone_map_owner is armature and len(_cached_bone_index) == len(pose_bones):
+        return
+
+    _cached_bone_index.clear()
+    for i, bone in enumerate(pose_bones):
+        _cached_bone_index[bone.name] = i
+    _bone_map_owner = armature
+
+
+def _resolve_bone_indices(armature, pose_bones, names):
+    """Map bone names to pose indices (None if missing) for foreach_get/set.
+
+    The cached map is validated once for the whole batch: each hit is
+    checked against pose_bones, and a rename (a hit with another name, or
+    a miss that pose_bones does have) forces a single rebuild.
+    """
+    _refresh_bone_map(armature, pose_bones)
+    index = _cached_bone_index
+    idxs = []
+    for name in names:
+        idx = index.get(name)
+        if idx is not None:
+            if pose_bones[idx].name != name:
+                break
+        elif name in pose_bones:
+            break
+        idxs.append(idx)
+    else:
+        return idxs
+
+    _refresh_bone_map(armature, pose_bones, force=True)
+    return [index.get(name) for name in names]
+
+
 def _get_pose_bone(armature, bone_name):
     """Get a pose bone by name, returns None if not found."""
     return armature.pose.bones.get(bone_name)
 
 
+_AXIS_INDEX = {"X": 0, "Y": 1, "Z": 2, "x": 0, "y": 1, "z": 2}
+
+# batch_move_bones transform name -> PoseBone vector property
+_TRANSFORM_PROPS = {"location": "location", "scale": "scale", "rotation": "rotation_euler"}
+
+
+# Rest-pose arrays for reset_all_bones, keyed by bone count
+_rest_buffers = {}
+
+
+def _get_rest_buffers(n):
+    """Return (zeros3, ones3, identity_quats) flat float32 arrays for `n` bones."""
+    buffers = _rest_buffers.get(n)
+    if buffers is None:
+        buffers = (
+            np.zeros(n * 3, dtype=np.float32),
+            np.ones(n * 3, dtype=np.float32),
+            np.tile(np.array([1, 0, 0, 0], dtype=np.float32), n),
+        )
+        _rest_buffers[n] = buffers
+    return buffers
+
+
 def _axis_index(axis_str):
     """Convert axis string to index: X=0, Y=1, Z=2."""
-    return {"X": 0, "Y": 1, "Z": 2}.get(axis_str.upper(), 0)
+    return _AXIS_INDEX.get(axis_str, 0)
 
 
 # --- Handler Functions ---
@@ -59,7 +163,6 @@ def handle_move_bone(params):
     axis = params.get("axis", "X").upper()
     amount = float(params.get("amount", 0.0))
 
-    _ensure_pose_mode(armature)
     bone = _get_pose_bone(armature, bone_name)
     if not bone:
         return {"status": "error", "error": f"Bone '{bone_name}' not found in armature '{armature.name}'"}
@@ -67,8 +170,8 @@ def handle_move_bone(params):
     idx = _axis_index(axis)
     bone.location[idx] += amount
 
-    # Force viewport update
-    bpy.context.view_layer.update()
+    # Viewport update is deferred to the end of the queue drain
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -76,7 +179,7 @@ def handle_move_bone(params):
             "bone_name": bone_name,
             "axis": axis,
             "amount": amount,
-            "new_location": list(bone.location)
+            "new_location": bone.location.to_tuple()
         }
     }
 
@@ -94,7 +197,6 @@ def handle_scale_bone(params):
     axis = params.get("axis", "X").upper()
     amount = float(params.get("amount", 1.0))
 
-    _ensure_pose_mode(armature)
     bone = _get_pose_bone(armature, bone_name)
     if not bone:
         return {"status": "error", "error": f"Bone '{bone_name}' not found"}
@@ -102,14 +204,14 @@ def handle_scale_bone(params):
     idx = _axis_index(axis)
     bone.scale[idx] *= (1.0 + amount)
 
-    bpy.context.view_layer.update()
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
         "result": {
             "bone_name": bone_name,
             "axis": axis,
-            "new_scale": list(bone.scale)
+            "new_scale": bone.scale.to_tuple()
         }
     }
 
@@ -127,7 +229,6 @@ def handle_rotate_bone(params):
     axis = params.get("axis", "X").upper()
     degrees = float(params.get("degrees", 0.0))
 
-    _ensure_pose_mode(armature)
     bone = _get_pose_bone(armature, bone_name)
     if not bone:
         return {"status": "error", "error": f"Bone '{bone_name}' not found"}
@@ -135,7 +236,7 @@ def handle_rotate_bone(params):
     idx = _axis_index(axis)
     bone.rotation_euler[idx] += math.radians(degrees)
 
-    bpy.context.view_layer.update()
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -158,55 +259,141 @@ def handle_get_bone_transform(params):
         return {"status": "error", "error": "No armature found."}
 
     bone_name = params.get("bone_name", "")
-    _ensure_pose_mode(armature)
     bone = _get_pose_bone(armature, bone_name)
     if not bone:
         return {"status": "error", "error": f"Bone '{bone_name}' not found"}
 
+    # head/tail come from the evaluated pose — apply edits from earlier in this tick
+    command_queue.flush_dirty()
+
     return {
         "status": "success",
         "result": {
             "bone_name": bone_name,
-            "location": list(bone.location),
+            "location": bone.location.to_tuple(),
             "rotation_euler": [math.degrees(r) for r in bone.rotation_euler],
-            "scale": list(bone.scale),
-            "head_world": list(armature.matrix_world @ bone.head),
-            "tail_world": list(armature.matrix_world @ bone.tail),
+            "scale": bone.scale.to_tuple(),
+            "head_world": (armature.matrix_world @ bone.head).to_tuple(),
+            "tail_world": (armature.matrix_world @ bone.tail).to_tuple(),
         }
     }
 
 
+@lru_cache(maxsize=64)
+def _compile_bone_filter(pattern):
+    """Compiled case-insensitive regex for a glob pattern, or None for a plain substring."""
+    if not any(c in pattern for c in "*?["):
+        return None
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
 def handle_list_bones(params):
     """List all bones in the active armature.
 
-    params: {filter: str (optional, glob/substring filter)}
+    Locations are read for the whole pose with one foreach_get; parent and
+    child flags are gathered in a single pass over the bones.
+
+    params: {
+        filter: str (optional; a glob such as "FACIAL_*" or "*jaw*" matches
+                whole names, anything else is a substring match; both
+                ignore case),
+        offset: int (optional, default 0),
+        limit: int (optional, default all),
+        format: "soa"|"aos" (optional, default "soa"),
+        names_only: bool (optional, default False)
+    }
+    Returns total (matching bones), offset, count (bones in this page),
+    next_offset (offset of the following page, or None after the last) and
+    either parallel names/locations/has_children/parents arrays ("soa")
+    or a bones list of {name, location, has_children, parent} ("aos").
+    With names_only, only the names array is returned and no pose data
+    is read.
     """
     armature = _get_armature()
     if not armature:
         return {"status": "error", "error": "No armature found."}
 
-    filter_str = params.get("filter", "").lower()
+    filter_str = params.get("filter", "")
+    offset = max(0, int(params.get("offset", 0)))
+    limit = params.get("limit")
+    fmt = params.get("format", "soa")
+    names_only = bool(params.get("names_only", False))
+
+    pose_bones = armature.pose.bones
+    n = len(pose_bones)
+
+    names = [None] * n
+    parents = [None] * n
+    if names_only:
+        for i, bone in enumerate(pose_bones):
+            names[i] = bone.name
+    else:
+        for i, bone in enumerate(pose_bones):
+            names[i] = bone.name
+            parent = bone.parent
+            if parent is not None:
+                parents[i] = parent.name
+    has_parent_of = set(parents)
+
+    if filter_str:
+        pattern = _compile_bone_filter(filter_str)
+        if pattern is not None:
+            match = pattern.match
+            matched = [i for i, name in enumerate(names) if match(name)]
+        else:
+            filter_str = filter_str.lower()
+            matched = [i for i, name in enumerate(names) if filter_str in name.lower()]
+    else:
+        matched = range(n)
+    total = len(matched)
+
+    page = matched[offset:offset + int(limit)] if limit is not None else matched[offset:]
+    next_offset = offset + len(page) if offset + len(page) < total else None
+
+    if names_only:
+        return {
+            "status": "success",
+            "result": {
+                "armature": armature.name,
+                "total": total,
+                "offset": offset,
+                "count": len(page),
+                "next_offset": next_offset,
+                "names": [names[i] for i in page],
+            }
+        }
 
-    bones = []
-    for bone in armature.pose.bones:
-        if filter_str and filter_str not in bone.name.lower():
-            continue
-        bones.append({
-            "name": bone.name,
-            "location": list(bone.location),
-            "has_children": len(bone.children) > 0,
-            "parent": bone.parent.name if bone.parent else None,
-        })
+    locs = np.empty(n * 3, dtype=np.float32)
+    pose_bones.foreach_get("location", locs)
+    locs = locs.reshape(n, 3)
 
-    return {
-        "status": "success",
-        "result": {
-            "armature": armature.name,
-            "count": len(bones),
-            "bones": bones
-        }
+    result = {
+        "armature": armature.name,
+        "total": total,
+        "offset": offset,
+        "count": len(page),
+        "next_offset": next_offset,
     }
 
+    if fmt == "aos":
+        result["bones"] = [
+            {
+                "name": names[i],
+                "location": locs[i].tolist(),
+                "has_children": names[i] in has_parent_of,
+                "parent": parents[i],
+            }
+            for i in page
+        ]
+    else:
+        page_names = [names[i] for i in page]
+        result["names"] = page_names
+        result["locations"] = locs[list(page)].tolist()
+        result["has_children"] = [name in has_parent_of for name in page_names]
+        result["parents"] = [parents[i] for i in page]
+
+    return {"status": "success", "result": result}
+
 
 def handle_reset_bone(params):
     """Reset a bone to its rest position.
@@ -218,7 +405,6 @@ def handle_reset_bone(params):
         return {"status": "error", "error": "No armature found."}
 
     bone_name = params.get("bone_name", "")
-    _ensure_pose_mode(armature)
     bone = _get_pose_bone(armature, bone_name)
     if not bone:
         return {"status": "error", "error": f"Bone '{bone_name}' not found"}
@@ -228,7 +414,7 @@ def handle_reset_bone(params):
     bone.rotation_quaternion = (1, 0, 0, 0)
     bone.scale = (1, 1, 1)
 
-    bpy.context.view_layer.update()
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -239,6 +425,8 @@ def handle_reset_bone(params):
 def handle_reset_all_bones(params):
     """Reset ALL pose bones to rest position.
 
+    Each transform is written for the whole pose with one foreach_set.
+
     params: {} (none required)
     """
     armature = _get_armature()
@@ -246,15 +434,18 @@ def handle_reset_all_bones(params):
         return {"status": "error", "error": "No armature found."}
 
     _ensure_pose_mode(armature)
-    count = 0
-    for bone in armature.pose.bones:
-        bone.location = (0, 0, 0)
-        bone.rotation_euler = (0, 0, 0)
-        bone.rotation_quaternion = (1, 0, 0, 0)
-        bone.scale = (1, 1, 1)
-        count += 1
+    pose_bones = armature.pose.bones
+    count = len(pose_bones)
+    zeros3, ones3, identity_quats = _get_rest_buffers(count)
 
-    bpy.context.view_layer.update()
+    pose_bones.foreach_set("location", zeros3)
+    pose_bones.foreach_set("rotation_euler", zeros3)
+    pose_bones.foreach_set("rotation_quaternion", identity_quats)
+    pose_bones.foreach_set("scale", ones3)
+    # foreach_set skips RNA update callbacks, so tag the pose for re-evaluation
+    armature.update_tag(refresh={"DATA"})
+
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -265,7 +456,11 @@ def handle_reset_all_bones(params):
 def handle_batch_move_bones(params):
     """Move multiple bones at once.
 
-    params: {operations: [{bone_name, axis, amount}, ...]}
+    Reads the pose's location/rotation/scale arrays once with foreach_get,
+    applies every operation in NumPy, and writes each touched array back
+    with a single foreach_set.
+
+    params: {operations: [{bone_name, axis, amount, transform}, ...]}
     """
     armature = _get_armature()
     if not armature:
@@ -274,28 +469,32 @@ def handle_batch_move_bones(params):
     operations = params.get("operations", [])
     _ensure_pose_mode(armature)
 
+    pose_bones = armature.pose.bones
+
     results = []
     skipped = []
+    axis_index = _AXIS_INDEX
+    # transform -> ([flat offsets], [amounts])
+    pending = {"location": ([], []), "scale": ([], []), "rotation": ([], [])}
+
+    bone_idxs = _resolve_bone_indices(
+        armature, pose_bones, [op.get("bone_name", "") for op in operations]
+    )
 
-    for op in operations:
+    for op, bone_idx in zip(operations, bone_idxs):
         bone_name = op.get("bone_name", "")
-        axis = op.get("axis", "X").upper()
+        axis = op.get("axis", "X")
         amount = float(op.get("amount", 0.0))
         transform = op.get("transform", "location")
 
-        bone = _get_pose_bone(armature, bone_name)
-        if not bone:
+        if bone_idx is None:
             skipped.append(bone_name)
             continue
 
-        idx = _axis_index(axis)
-
-        if transform == "location":
-            bone.location[idx] += amount
-        elif transform == "scale":
-            bone.scale[idx] *= (1.0 + amount)
-        elif transform == "rotation":
-            bone.rotation_euler[idx] += math.radians(amount)
+        target = pending.get(transform)
+        if target is not None:
+            target[0].append(bone_idx * 3 + axis_index.get(axis, 0))
+            target[1].append(amount)
 
         results.append({
             "bone_name": bone_name,
@@ -304,7 +503,28 @@ def handle_batch_move_bones(params):
             "amount": amount
         })
 
-    bpy.context.view_layer.update()
+    n = len(pose_bones)
+    for transform, (offsets, amounts) in pending.items():
+        if not offsets:
+            continue
+        prop = _TRANSFORM_PROPS[transform]
+        values = np.empty(n * 3, dtype=np.float32)
+        pose_bones.foreach_get(prop, values)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        amounts = np.asarray(amounts, dtype=np.float32)
+        if transform == "location":
+            np.add.at(values, offsets, amounts)
+        elif transform == "scale":
+            np.multiply.at(values, offsets, 1.0 + amounts)
+        else:
+            np.add.at(values, offsets, np.radians(amounts))
+        pose_bones.foreach_set(prop, values)
+
+    if any(offsets for offsets, _ in pending.values()):
+        # foreach_set skips RNA update callbacks, so tag the pose for re-evaluation
+        armature.update_tag(refresh={"DATA"})
+
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -6,19 +6,153 @@ import bpy
 import os
 import tempfile
 import base64
+import hashlib
+import itertools
 import math
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..utils import scene_cache
 
 logger = logging.getLogger("blender_metahuman_mcp.export_handler")
 
+# Camera/light used by render_preview, reused across calls; cleared on structural changes
+_preview_cam = None
+_preview_light = None
+
+
+@scene_cache.on_structure_change
+def _invalidate_preview_objects():
+    global _preview_cam, _preview_light
+    _preview_cam = None
+    _preview_light = None
+
+
+def _in_scene(obj, scene):
+    """Check that a cached object still exists and is linked to `scene`."""
+    try:
+        return obj is not None and scene.objects.get(obj.name) is obj
+    except ReferenceError:
+        return False
+
+# Async export jobs: export_id -> status dict (oldest dropped past _MAX_JOBS)
+_MAX_JOBS = 32
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+_job_ids = itertools.count(1)
+
+# Post-write work (size, checksum) runs off the main thread; created on
+# first use and shut down when the addon is unregistered
+_post_executor = None
+
+
+def _get_post_executor():
+    global _post_executor
+    if _post_executor is None:
+        _post_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mcp-export")
+    return _post_executor
+
+
+def shutdown_post_executor():
+    """Stop the post-processing workers, dropping exports not yet started."""
+    global _post_executor
+    if _post_executor is not None:
+        _post_executor.shutdown(wait=False, cancel_futures=True)
+        _post_executor = None
+
+
+def _update_job(export_id, **fields):
+    with _jobs_lock:
+        job = _jobs.get(export_id)
+        if job is not None:
+            job.update(fields)
+
+
+def _file_sha256(filepath):
+    """Hash a file with large sequential reads."""
+    digest = hashlib.sha256()
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        offset = 0
+        while True:
+            chunk = os.pread(fd, 1 << 20, offset) if hasattr(os, "pread") else os.read(fd, 1 << 20)
+            if not chunk:
+                break
+            digest.update(chunk)
+            offset += len(chunk)
+    finally:
+        os.close(fd)
+    return digest.hexdigest()
+
+
+def _post_process(export_id, result, checksum):
+    """Fill in file size (and optionally SHA-256) for a finished export."""
+    try:
+        filepath = result["filepath"]
+        result["file_size_bytes"] = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        if checksum and result["file_size_bytes"]:
+            result["sha256"] = _file_sha256(filepath)
+        _update_job(export_id, status="success", result=result)
+    except Exception as e:
+        _update_job(export_id, status="error", error=f"Post-export step failed: {e}")
+
+
+def _export_fbx(filepath, selected_only, apply_modifiers):
+    """Run the FBX exporter. Must be called on the main thread."""
+    # Ensure directory exists
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    # Ensure object mode
+    if bpy.context.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+    bpy.ops.export_scene.fbx(
+        filepath=filepath,
+        use_selection=selected_only,
+        apply_scale_options="FBX_SCALE_ALL",
+        use_mesh_modifiers=apply_modifiers,
+        mesh_smooth_type="FACE",
+        add_leaf_bones=False,
+        bake_anim=False,
+        axis_forward="-Y",
+        axis_up="Z",
+    )
+
+
+def _run_export_job(export_id, filepath, selected_only, apply_modifiers, checksum):
+    """Timer callback: export on the main thread, then hand off post-processing."""
+    _update_job(export_id, status="exporting")
+    try:
+        _export_fbx(filepath, selected_only, apply_modifiers)
+    except Exception as e:
+        _update_job(export_id, status="error", error=f"FBX export failed: {e}")
+        return None
+
+    _update_job(export_id, status="finalizing")
+    result = {"filepath": filepath, "selected_only": selected_only}
+    _get_post_executor().submit(_post_process, export_id, result, checksum)
+    return None  # One-shot timer
+
 
 def handle_export_fbx(params):
     """Export scene/selected objects as FBX for Unreal Engine.
 
+    With async=True the export is scheduled for the next timer tick and
+    the handler returns {status: "pending", export_id} immediately; poll
+    it with poll_export_status.
+
     params: {
         filepath: str,
         selected_only: bool (default True),
-        apply_modifiers: bool (default True)
+        apply_modifiers: bool (default True),
+        async: bool (default False),
+        checksum: bool (default False, adds sha256 to the result)
     }
     """
     filepath = params.get("filepath", "")
@@ -28,41 +162,110 @@ def handle_export_fbx(params):
 
     selected_only = params.get("selected_only", True)
     apply_modifiers = params.get("apply_modifiers", True)
+    checksum = params.get("checksum", False)
 
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-    # Ensure object mode
-    if bpy.context.mode != "OBJECT":
-        bpy.ops.object.mode_set(mode="OBJECT")
+    if params.get("async", False):
+        export_id = str(next(_job_ids))
+        with _jobs_lock:
+            _jobs[export_id] = {"export_id": export_id, "status": "pending", "filepath": filepath}
+            while len(_jobs) > _MAX_JOBS:
+                _jobs.popitem(last=False)
+        bpy.app.timers.register(
+            lambda: _run_export_job(export_id, filepath, selected_only, apply_modifiers, checksum),
+            first_interval=0.0,
+        )
+        return {
+            "status": "pending",
+            "result": {"export_id": export_id, "filepath": filepath}
+        }
 
     try:
-        bpy.ops.export_scene.fbx(
-            filepath=filepath,
-            use_selection=selected_only,
-            apply_scale_options="FBX_SCALE_ALL",
-            use_mesh_modifiers=apply_modifiers,
-            mesh_smooth_type="FACE",
-            add_leaf_bones=False,
-            bake_anim=False,
-            axis_forward="-Y",
-            axis_up="Z",
-        )
+        _export_fbx(filepath, selected_only, apply_modifiers)
 
         file_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
-
-        return {
-            "status": "success",
-            "result": {
-                "filepath": filepath,
-                "file_size_bytes": file_size,
-                "selected_only": selected_only,
-            }
+        result = {
+            "filepath": filepath,
+            "file_size_bytes": file_size,
+            "selected_only": selected_only,
         }
+        if checksum and file_size:
+            result["sha256"] = _file_sha256(filepath)
+
+        return {"status": "success", "result": result}
     except Exception as e:
         return {"status": "error", "error": f"FBX export failed: {e}"}
 
 
+def handle_poll_export_status(params):
+    """Report the state of an async export.
+
+    params: {export_id: str}
+    Returns status "pending"|"exporting"|"finalizing"|"success"|"error";
+    finished jobs carry the same result as a synchronous export_fbx.
+    """
+    export_id = str(params.get("export_id", ""))
+    with _jobs_lock:
+        job = _jobs.get(export_id)
+        job = dict(job) if job is not None else None
+
+    if job is None:
+        return {"status": "error", "error": f"Unknown export_id: '{export_id}'"}
+    return {"status": "success", "result": job}
+
+
+def _find_view3d():
+    """Return (space, region) of the first 3D viewport, or (None, None) in background mode."""
+    wm = bpy.context.window_manager
+    for window in wm.windows if wm else ():
+        for area in window.screen.areas:
+            if area.type != "VIEW_3D":
+                continue
+            for region in area.regions:
+                if region.type == "WINDOW":
+                    return area.spaces.active, region
+    return None, None
+
+
+def _render_offscreen(scene, camera, res_x, res_y, filepath):
+    """Draw the viewport from `camera` into a GPU offscreen buffer and save it as PNG.
+
+    Returns False when no 3D viewport / GPU context is available so the
+    caller can fall back to the full render pipeline.
+    """
+    space, region = _find_view3d()
+    if space is None:
+        return False
+
+    import gpu
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    view_matrix = camera.matrix_world.inverted()
+    projection_matrix = camera.calc_matrix_camera(depsgraph, x=res_x, y=res_y)
+
+    offscreen = gpu.types.GPUOffScreen(res_x, res_y)
+    try:
+        with offscreen.bind():
+            offscreen.draw_view3d(
+                scene, bpy.context.view_layer, space, region,
+                view_matrix, projection_matrix, do_color_management=True,
+            )
+            fb = gpu.state.active_framebuffer_get()
+            buffer = fb.read_color(0, 0, res_x, res_y, 4, 0, "FLOAT")
+    finally:
+        offscreen.free()
+
+    buffer.dimensions = res_x * res_y * 4
+    pixels = np.array(buffer, dtype=np.float32)
+
+    image = bpy.data.images.new("MCP_Preview_Offscreen", res_x, res_y, alpha=True)
+    try:
+        image.pixels.foreach_set(pixels)
+        image.save_render(filepath, scene=scene)
+    finally:
+        bpy.data.images.remove(image)
+    return True
+
+
 def handle_render_preview(params):
     """Render a preview of the current viewport.
 
@@ -70,10 +273,13 @@ def handle_render_preview(params):
         angle: "front"|"side"|"three_quarter"|"current" (default "front"),
         resolution_x: int (default 512),
         resolution_y: int (default 512),
-        filepath: str (optional, defaults to temp file)
+        filepath: str (optional, defaults to temp file),
+        engine: "render"|"offscreen" (default "render"; "offscreen" grabs a
+                GPU viewport snapshot instead of running Cycles/Eevee)
     }
     """
     angle = params.get("angle", "front")
+    engine = params.get("engine", "render")
     res_x = int(params.get("resolution_x", 512))
     res_y = int(params.get("resolution_y", 512))
     filepath = params.get("filepath", "")
@@ -90,12 +296,15 @@ def handle_render_preview(params):
     scene.render.image_settings.file_format = "PNG"
     scene.render.filepath = filepath
 
+    global _preview_cam, _preview_light
+
     # Position camera based on angle
-    camera = None
-    for obj in scene.objects:
-        if obj.type == "CAMERA":
-            camera = obj
-            break
+    camera = _preview_cam if _in_scene(_preview_cam, scene) else None
+    if camera is None:
+        for obj in scene.objects:
+            if obj.type == "CAMERA":
+                camera = obj
+                break
 
     if not camera:
         # Create a temporary camera using data API (no operator context needed)
@@ -104,11 +313,13 @@ def handle_render_preview(params):
         camera = bpy.data.objects.new("MCP_Preview_Camera", cam_data)
         bpy.context.collection.objects.link(camera)
 
+    _preview_cam = camera
     scene.camera = camera
 
     # Ensure we have a light for rendering
-    has_light = any(obj.type == "LIGHT" for obj in scene.objects)
-    if not has_light:
+    if not _in_scene(_preview_light, scene):
+        _preview_light = next((obj for obj in scene.objects if obj.type == "LIGHT"), None)
+    if _preview_light is None:
         light_data = bpy.data.lights.new(name="MCP_Preview_Light", type="AREA")
         light_data.energy = 100
         light_data.size = 0.5
@@ -116,6 +327,7 @@ def handle_render_preview(params):
         bpy.context.collection.objects.link(light_obj)
         light_obj.location = (0.3, -0.5, 2.0)
         light_obj.rotation_euler = (math.radians(30), 0, math.radians(10))
+        _preview_light = light_obj
 
     # Find the head/face center for aiming
     target_loc = (0, 0, 1.6)  # Default head height
@@ -144,7 +356,11 @@ def handle_render_preview(params):
     # "current" = don't move camera
 
     try:
-        bpy.ops.render.render(write_still=True)
+        if engine == "offscreen" and _render_offscreen(scene, camera, res_x, res_y, filepath):
+            used_engine = "offscreen"
+        else:
+            bpy.ops.render.render(write_still=True)
+            used_engine = "render"
 
         return {
             "status": "success",
@@ -152,6 +368,7 @@ def handle_render_preview(params):
                 "filepath": filepath,
                 "angle": angle,
                 "resolution": f"{res_x}x{res_y}",
+                "engine": used_engine,
             }
         }
     except Exception as e:
@@ -162,5 +379,6 @@ def get_export_handlers():
     """Return dict mapping command names to handler functions."""
     return {
         "export_fbx": handle_export_fbx,
+        "poll_export_status": handle_poll_export_status,
         "render_preview": handle_render_preview,
     }
@@ -7,35 +7,78 @@ Provides info about mesh geometry, vertex groups, and dimensions.
 import bpy
 import logging
 
+from ..utils import scene_cache
+
 logger = logging.getLogger("blender_metahuman_mcp.mesh_handler")
 
+# Resolved mesh objects keyed by requested name (None = auto-detected head mesh)
+_mesh_cache = {}
+
+# Object name -> lowercased name, for the head/face search
+_mesh_name_lc_cache = {}
+
+
+@scene_cache.on_structure_change
+def _invalidate_mesh_cache():
+    _mesh_cache.clear()
+    _mesh_name_lc_cache.clear()
+
+
+def _lower_name(name):
+    lower = _mesh_name_lc_cache.get(name)
+    if lower is None:
+        lower = _mesh_name_lc_cache[name] = name.lower()
+    return lower
+
+
+def _is_valid(obj, name):
+    """Check that a cached object has not been deleted or renamed."""
+    try:
+        return obj.name in bpy.data.objects and (not name or obj.name == name)
+    except ReferenceError:
+        return False
+
 
 def _get_mesh_object(name=None):
     """Get a mesh object by name, or find the head/face mesh."""
+    if not name:
+        # Try active object
+        obj = bpy.context.active_object
+        if obj and obj.type == "MESH":
+            return obj
+
+    key = name or None
+    cached = _mesh_cache.get(key)
+    if cached is not None and _is_valid(cached, key):
+        return cached
+
+    obj = _find_mesh_object(name)
+    if obj is not None:
+        _mesh_cache[key] = obj
+    else:
+        _mesh_cache.pop(key, None)
+    return obj
+
+
+def _find_mesh_object(name):
+    """Uncached lookup behind _get_mesh_object()."""
     if name:
         obj = bpy.data.objects.get(name)
         if obj and obj.type == "MESH":
             return obj
         return None
 
-    # Try active object
-    obj = bpy.context.active_object
-    if obj and obj.type == "MESH":
-        return obj
-
-    # Search for head/face mesh
+    # Search for head/face mesh, remembering the first mesh as a fallback
+    first_mesh = None
     for obj in bpy.context.scene.objects:
         if obj.type == "MESH":
-            lower = obj.name.lower()
+            lower = _lower_name(obj.name)
             if "head" in lower or "face" in lower:
                 return obj
+            if first_mesh is None:
+                first_mesh = obj
 
-    # Fallback: first mesh
-    for obj in bpy.context.scene.objects:
-        if obj.type == "MESH":
-            return obj
-
-    return None
+    return first_mesh
 
 
 def handle_get_mesh_info(params):
@@ -48,7 +91,7 @@ def handle_get_mesh_info(params):
         return {"status": "error", "error": "No mesh found."}
 
     mesh = obj.data
-    bounds = [list(v) for v in obj.bound_box]
+    bounds = [v[:] for v in obj.bound_box]
 
     return {
         "status": "success",
@@ -60,8 +103,8 @@ def handle_get_mesh_info(params):
             "has_shape_keys": mesh.shape_keys is not None,
             "shape_key_count": len(mesh.shape_keys.key_blocks) if mesh.shape_keys else 0,
             "vertex_group_count": len(obj.vertex_groups),
-            "dimensions": list(obj.dimensions),
-            "location": list(obj.location),
+            "dimensions": obj.dimensions.to_tuple(),
+            "location": obj.location.to_tuple(),
             "bounding_box": bounds,
             "material_count": len(obj.material_slots),
             "materials": [slot.material.name if slot.material else None for slot in obj.material_slots],
@@ -72,57 +115,83 @@ def handle_get_mesh_info(params):
 def handle_get_vertex_groups(params):
     """List all vertex groups on a mesh.
 
-    params: {name: str (optional), filter: str (optional)}
+    params: {name: str (optional), filter: str (optional), format: "soa"|"aos" (default "soa")}
+    Returns parallel names/indices/lock_weights arrays ("soa") or a
+    vertex_groups list of {name, index, lock_weight} ("aos").
     """
     obj = _get_mesh_object(params.get("name"))
     if not obj:
         return {"status": "error", "error": "No mesh found."}
 
     filter_str = params.get("filter", "").lower()
-    groups = []
+    names = []
+    indices = []
+    lock_weights = []
 
     for vg in obj.vertex_groups:
-        if filter_str and filter_str not in vg.name.lower():
+        name = vg.name
+        if filter_str and filter_str not in name.lower():
             continue
-        groups.append({
-            "name": vg.name,
-            "index": vg.index,
-            "lock_weight": vg.lock_weight,
-        })
+        names.append(name)
+        indices.append(vg.index)
+        lock_weights.append(vg.lock_weight)
 
-    return {
-        "status": "success",
-        "result": {
-            "mesh": obj.name,
-            "count": len(groups),
-            "vertex_groups": groups
-        }
-    }
+    result = {"mesh": obj.name, "count": len(names)}
+    if params.get("format", "soa") == "aos":
+        result["vertex_groups"] = [
+            {"name": name, "index": index, "lock_weight": lock}
+            for name, index, lock in zip(names, indices, lock_weights)
+        ]
+    else:
+        result["names"] = names
+        result["indices"] = indices
+        result["lock_weights"] = lock_weights
+
+    return {"status": "success", "result": result}
 
 
 def handle_list_meshes(params):
     """List all mesh objects in the scene.
 
-    params: {} (none required)
+    params: {format: "soa"|"aos" (optional, default "soa")}
+    Returns parallel names/vertex_counts/has_shape_keys/locations/visible
+    arrays ("soa") or a meshes list of per-mesh dicts ("aos").
     """
-    meshes = []
+    names = []
+    vertex_counts = []
+    has_shape_keys = []
+    locations = []
+    visible = []
     for obj in bpy.context.scene.objects:
         if obj.type == "MESH":
-            meshes.append({
-                "name": obj.name,
-                "vertex_count": len(obj.data.vertices),
-                "has_shape_keys": obj.data.shape_keys is not None,
-                "location": list(obj.location),
-                "visible": obj.visible_get(),
-            })
-
-    return {
-        "status": "success",
-        "result": {
-            "count": len(meshes),
-            "meshes": meshes
-        }
-    }
+            mesh = obj.data
+            names.append(obj.name)
+            vertex_counts.append(len(mesh.vertices))
+            has_shape_keys.append(mesh.shape_keys is not None)
+            locations.append(obj.location.to_tuple())
+            visible.append(obj.visible_get())
+
+    result = {"count": len(names)}
+    if params.get("format", "soa") == "aos":
+        result["meshes"] = [
+            {
+                "name": name,
+                "vertex_count": vertex_count,
+                "has_shape_keys": shape_keys,
+                "location": location,
+                "visible": is_visible,
+            }
+            for name, vertex_count, shape_keys, location, is_visible
+            in zip(names, vertex_counts, has_shape_keys, locations, visible)
+        ]
+    else:
+        result["names"] = names
+        result["vertex_counts"] = vertex_counts
+        result["has_shape_keys"] = has_shape_keys
+        result["locations"] = locations
+        result["visible"] = visible
+
+    return {"status": "success", "result": result}
 
 
 def get_mesh_handlers():
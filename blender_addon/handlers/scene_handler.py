@@ -6,42 +6,55 @@ Handles scene info, object selection, undo/redo, and FBX import.
 
 import bpy
 import os
+import pathlib
 import logging
 
+import numpy as np
+
 logger = logging.getLogger("blender_metahuman_mcp.scene_handler")
 
 
 def handle_get_scene_info(params):
     """Get overview of the current scene.
 
-    params: {} (none required)
+    Object locations are read for the whole scene with one foreach_get;
+    only visibility/selection (which have no bulk accessor) stay per-object.
+
+    params: {include_objects: bool (optional, default True; False skips the per-object list)}
     """
     scene = bpy.context.scene
-    objects = []
+    scene_objects = scene.objects
+    n = len(scene_objects)
+    active = bpy.context.active_object
 
-    for obj in scene.objects:
-        objects.append({
+    result = {
+        "scene_name": scene.name,
+        "object_count": n,
+        "active_object": active.name if active else None,
+        "active_type": active.type if active else None,
+        "mode": bpy.context.mode,
+        "frame_current": scene.frame_current,
+    }
+
+    if not params.get("include_objects", True):
+        return {"status": "success", "result": result}
+
+    locs = np.empty(n * 3, dtype=np.float32)
+    scene_objects.foreach_get("location", locs)
+    locs = locs.reshape(n, 3).tolist()
+
+    result["objects"] = [
+        {
             "name": obj.name,
             "type": obj.type,
-            "location": list(obj.location),
+            "location": loc,
             "visible": obj.visible_get(),
             "selected": obj.select_get(),
-        })
-
-    active = bpy.context.active_object
-
-    return {
-        "status": "success",
-        "result": {
-            "scene_name": scene.name,
-            "object_count": len(objects),
-            "active_object": active.name if active else None,
-            "active_type": active.type if active else None,
-            "mode": bpy.context.mode,
-            "frame_current": scene.frame_current,
-            "objects": objects,
         }
-    }
+        for obj, loc in zip(scene_objects, locs)
+    ]
+
+    return {"status": "success", "result": result}
 
 
 def handle_select_object(params):
@@ -61,7 +74,9 @@ def handle_select_object(params):
         bpy.ops.object.mode_set(mode="OBJECT")
 
     if not add_to_selection:
-        bpy.ops.object.select_all(action="DESELECT")
+        # Direct RNA writes; the select_all operator also validates context and pushes undo
+        for selected in list(bpy.context.view_layer.objects.selected):
+            selected.select_set(False)
 
     obj.select_set(True)
     bpy.context.view_layer.objects.active = obj
@@ -105,24 +120,32 @@ def handle_import_fbx(params):
     if not filepath:
         return {"status": "error", "error": "No filepath provided"}
 
-    if not os.path.exists(filepath):
+    # isfile (not exists) so a directory fails here rather than inside the importer
+    if not os.path.isfile(filepath):
         return {"status": "error", "error": f"File not found: {filepath}"}
+    try:
+        filepath = os.fspath(pathlib.Path(filepath).resolve(strict=True))
+    except OSError as e:
+        return {"status": "error", "error": f"Cannot resolve path {filepath}: {e}"}
 
     # Ensure object mode
     if bpy.context.mode != "OBJECT":
         bpy.ops.object.mode_set(mode="OBJECT")
 
     try:
+        before = set(bpy.data.objects.keys())
         bpy.ops.import_scene.fbx(filepath=filepath)
 
-        # Find imported objects (they'll be selected)
-        imported = [obj.name for obj in bpy.context.selected_objects]
+        # Imported objects are the ones that didn't exist before (in data order);
+        # this doesn't depend on what the importer left selected
+        imported = [name for name in bpy.data.objects.keys() if name not in before]
 
         # Try to find the armature
         armature = None
-        for obj in bpy.context.selected_objects:
+        for name in imported:
+            obj = bpy.data.objects[name]
             if obj.type == "ARMATURE":
-                armature = obj.name
+                armature = name
                 bpy.context.view_layer.objects.active = obj
                 break
 
@@ -152,9 +175,9 @@ def handle_delete_object(params):
     if bpy.context.mode != "OBJECT":
         bpy.ops.object.mode_set(mode="OBJECT")
 
-    bpy.ops.object.select_all(action="DESELECT")
-    obj.select_set(True)
-    bpy.ops.object.delete()
+    bpy.data.objects.remove(obj, do_unlink=True)
+    # Data-API removal doesn't create an undo step; keep delete undoable
+    bpy.ops.ed.undo_push(message=f"MCP: delete {name}")
 
     return {"status": "success", "result": {"deleted": name}}
 
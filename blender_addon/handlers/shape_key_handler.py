@@ -7,27 +7,100 @@ Shape keys control facial expressions, corrective shapes, and morph targets.
 import bpy
 import logging
 
+import numpy as np
+
+from ..utils import scene_cache
+from ..utils.thread_safe import command_queue
+
 logger = logging.getLogger("blender_metahuman_mcp.shape_key_handler")
 
+# Mesh found by scanning the scene; cleared on structural changes
+_cached_mesh = None
+
+# Shape key name -> key_blocks index, for the Key datablock in _key_index_owner
+_key_index_owner = None
+_key_index = {}
+
+
+@scene_cache.on_structure_change
+def _invalidate_shape_key_cache():
+    global _cached_mesh, _key_index_owner
+    _cached_mesh = None
+    _key_index_owner = None
+    _key_index.clear()
+
+
+def _has_shape_keys(obj):
+    """Check that a cached object still exists and still carries shape keys."""
+    try:
+        return obj.name in bpy.data.objects and obj.type == "MESH" and obj.data.shape_keys is not None
+    except ReferenceError:
+        return False
+
 
 def _get_mesh_with_shape_keys():
     """Find the active mesh object that has shape keys, or search for one."""
+    global _cached_mesh
+
     obj = bpy.context.active_object
     if obj and obj.type == "MESH" and obj.data.shape_keys:
         return obj
 
-    # Search for a mesh with shape keys (prefer head mesh)
+    if _cached_mesh is not None and _has_shape_keys(_cached_mesh):
+        return _cached_mesh
+
+    # Search for a mesh with shape keys (prefer head mesh), falling back
+    # to the first one found
+    _cached_mesh = None
+    fallback = None
     for obj in bpy.context.scene.objects:
         if obj.type == "MESH" and obj.data.shape_keys:
-            if "head" in obj.name.lower() or "face" in obj.name.lower():
+            lower = obj.name.lower()
+            if "head" in lower or "face" in lower:
+                _cached_mesh = obj
                 return obj
+            if fallback is None:
+                fallback = obj
 
-    # Fallback: any mesh with shape keys
-    for obj in bpy.context.scene.objects:
-        if obj.type == "MESH" and obj.data.shape_keys:
-            return obj
+    _cached_mesh = fallback
+    return fallback
 
-    return None
+
+def _get_key_index(shape_keys):
+    """Return the cached shape key name -> index mapping for `shape_keys`.
+
+    Rebuilt when a different Key datablock is passed in or its key count changes.
+    """
+    global _key_index_owner
+    key_blocks = shape_keys.key_blocks
+    owner = (shape_keys.name, len(key_blocks))
+    if owner != _key_index_owner:
+        _key_index.clear()
+        for i, kb in enumerate(key_blocks):
+            _key_index[kb.name] = i
+        _key_index_owner = owner
+    return _key_index
+
+
+def _find_key_index(shape_keys, name):
+    """Get a key block's index by name via the cached index, or None."""
+    global _key_index_owner
+    idx = _get_key_index(shape_keys).get(name)
+    if idx is not None:
+        if shape_keys.key_blocks[idx].name == name:
+            return idx
+    elif name not in shape_keys.key_blocks:
+        return None
+
+    # A rename made the index stale — rebuild it and retry once
+    _key_index_owner = None
+    return _get_key_index(shape_keys).get(name)
+
+
+def _get_key_block(shape_keys, name):
+    """Get a key block by name via the cached index, or None."""
+    idx = _find_key_index(shape_keys, name)
+    return shape_keys.key_blocks[idx] if idx is not None else None
 
 
 def handle_set_shape_key(params):
@@ -43,12 +116,12 @@ def handle_set_shape_key(params):
     value = float(params.get("value", 0.0))
     value = max(0.0, min(1.0, value))  # Clamp to valid range
 
-    key_block = obj.data.shape_keys.key_blocks.get(name)
+    key_block = _get_key_block(obj.data.shape_keys, name)
     if not key_block:
         return {"status": "error", "error": f"Shape key '{name}' not found on '{obj.name}'"}
 
     key_block.value = value
-    bpy.context.view_layer.update()
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -70,7 +143,7 @@ def handle_get_shape_key(params):
         return {"status": "error", "error": "No mesh with shape keys found."}
 
     name = params.get("name", "")
-    key_block = obj.data.shape_keys.key_blocks.get(name)
+    key_block = _get_key_block(obj.data.shape_keys, name)
     if not key_block:
         return {"status": "error", "error": f"Shape key '{name}' not found"}
 
@@ -88,20 +161,39 @@ def handle_get_shape_key(params):
 
 
 def handle_list_shape_keys(params):
-    """List all shape keys on the mesh.
+    """List the shape keys on the mesh.
+
+    Names are filtered first; key details are only read for the requested page.
 
-    params: {filter: str (optional substring filter)}
+    params: {
+        filter: str (optional substring filter, ignores case),
+        offset: int (optional, default 0),
+        limit: int (optional, default all)
+    }
+    Returns total (matching keys), offset, count (keys in this page),
+    next_offset (offset of the following page, or None after the last)
+    and the shape_keys list.
     """
     obj = _get_mesh_with_shape_keys()
     if not obj:
         return {"status": "error", "error": "No mesh with shape keys found."}
 
     filter_str = params.get("filter", "").lower()
-    shape_keys = []
+    offset = max(0, int(params.get("offset", 0)))
+    limit = params.get("limit")
+
+    key_blocks = obj.data.shape_keys.key_blocks
+    if filter_str:
+        matched = [kb for kb in key_blocks if filter_str in kb.name.lower()]
+    else:
+        matched = list(key_blocks)
+    total = len(matched)
 
-    for kb in obj.data.shape_keys.key_blocks:
-        if filter_str and filter_str not in kb.name.lower():
-            continue
+    page = matched[offset:offset + int(limit)] if limit is not None else matched[offset:]
+    next_offset = offset + len(page) if offset + len(page) < total else None
+
+    shape_keys = []
+    for kb in page:
         shape_keys.append({
             "name": kb.name,
             "value": kb.value,
@@ -114,7 +206,10 @@ def handle_list_shape_keys(params):
         "status": "success",
         "result": {
             "mesh": obj.name,
+            "total": total,
+            "offset": offset,
             "count": len(shape_keys),
+            "next_offset": next_offset,
             "shape_keys": shape_keys
         }
     }
@@ -123,20 +218,29 @@ def handle_list_shape_keys(params):
 def handle_reset_all_shape_keys(params):
     """Reset all shape keys to 0.0.
 
+    Written with one foreach_set, like handle_batch_set_shape_keys.
+
     params: {} (none required)
     """
     obj = _get_mesh_with_shape_keys()
     if not obj:
         return {"status": "error", "error": "No mesh with shape keys found."}
 
-    count = 0
-    for kb in obj.data.shape_keys.key_blocks:
-        if kb.name == "Basis":
-            continue  # Don't touch the basis shape
-        kb.value = 0.0
-        count += 1
+    shape_keys = obj.data.shape_keys
+    key_blocks = shape_keys.key_blocks
+    values = np.zeros(len(key_blocks), dtype=np.float32)
+    count = len(key_blocks)
 
-    bpy.context.view_layer.update()
+    # Don't touch the basis shape
+    basis_idx = key_blocks.find("Basis")
+    if basis_idx >= 0:
+        values[basis_idx] = key_blocks[basis_idx].value
+        count -= 1
+
+    key_blocks.foreach_set("value", values)
+    # foreach_set skips RNA update callbacks, so tag the Key for re-evaluation
+    shape_keys.update_tag()
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
@@ -147,6 +251,10 @@ def handle_reset_all_shape_keys(params):
 def handle_batch_set_shape_keys(params):
     """Set multiple shape keys at once.
 
+    Values are clamped as one NumPy array and scattered into the current
+    values (read with one foreach_get), then written back with one
+    foreach_set.
+
     params: {values: {shape_key_name: float_value, ...}}
     """
     obj = _get_mesh_with_shape_keys()
@@ -155,17 +263,39 @@ def handle_batch_set_shape_keys(params):
 
     values = params.get("values", {})
     applied = []
-    skipped = []
-
-    for name, value in values.items():
-        kb = obj.data.shape_keys.key_blocks.get(name)
-        if not kb:
-            skipped.append(name)
-            continue
-        kb.value = max(0.0, min(1.0, float(value)))
-        applied.append({"name": name, "value": kb.value})
 
-    bpy.context.view_layer.update()
+    shape_keys = obj.data.shape_keys
+    key_blocks = shape_keys.key_blocks
+
+    # Resolve names first so a stale (renamed) index is rebuilt before writing
+    names = list(values)
+    idxs = np.empty(len(names), dtype=np.intp)
+    for i, name in enumerate(names):
+        idx = _find_key_index(shape_keys, name)
+        idxs[i] = -1 if idx is None else idx
+
+    found = idxs >= 0
+    found_list = found.tolist()
+    skipped = [name for name, ok in zip(names, found_list) if not ok]
+
+    if found.any():
+        # Clamped in float64 so "applied" reports the requested values;
+        # the assignment below narrows them to the float32 property array
+        vals = np.fromiter((float(v) for v in values.values()), dtype=np.float64, count=len(names))
+        np.clip(vals, 0.0, 1.0, out=vals)
+
+        arr = np.empty(len(key_blocks), dtype=np.float32)
+        key_blocks.foreach_get("value", arr)
+        arr[idxs[found]] = vals[found]
+        key_blocks.foreach_set("value", arr)
+        # foreach_set skips RNA update callbacks, so tag the Key for re-evaluation
+        shape_keys.update_tag()
+        applied = [
+            {"name": name, "value": value}
+            for name, ok, value in zip(names, found_list, vals.tolist()) if ok
+        ]
+
+    command_queue.mark_dirty()
 
     return {
         "status": "success",
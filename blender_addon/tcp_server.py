@@ -1,20 +1,152 @@
 """
-Threaded TCP server that runs inside Blender.
+Single-threaded TCP server that runs inside Blender.
 
 Listens for JSON commands from the MCP server process,
 dispatches them through the command router (on the main thread),
-and returns JSON responses.
+and returns JSON responses. One I/O thread multiplexes every client
+with `selectors`; handlers never block it — results are handed back
+from the main thread and written out when the socket is ready.
 
 Protocol: Newline-delimited JSON (each message terminated by \n)
+  Single command: {"id": ..., "command": "move_bone", "params": {...}}
+  Batch:          {"id": ..., "commands": [{"id": ..., "command": ..., "params": {...}}, ...]}
 """
 
+import collections
+import functools
+import selectors
 import socket
 import threading
+import time
 import json
 import logging
 
 logger = logging.getLogger("blender_metahuman_mcp.tcp_server")
 
+COMMAND_TIMEOUT = 15.0  # Seconds before a pending response is failed
+
+# Read-only commands whose encoded result is reused for identical params
+# until the scene changes (any depsgraph update or scene-changing command)
+CACHEABLE_COMMANDS = frozenset({
+    "get_bone_transform",
+    "list_bones",
+    "get_shape_key",
+    "list_shape_keys",
+    "get_mesh_info",
+    "get_vertex_groups",
+    "list_meshes",
+})
+RESPONSE_CACHE_SIZE = 64
+
+# Commands that change nothing but aren't worth caching; like the router's
+# direct (non-bpy) commands, they leave cached responses in place
+READ_ONLY_COMMANDS = frozenset({
+    "get_scene_info",
+    "poll_export_status",
+})
+
+
+def _json_default(obj):
+    """Serialize mathutils vectors/matrices and NumPy values that JSON doesn't know."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    try:
+        return list(obj)
+    except TypeError:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# orjson is much faster on large payloads (list_bones, batch results) but is
+# not bundled with Blender, so fall back to the stdlib when it's missing.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    def _canonical(obj):
+        """Deterministic encoding of request params, used as a cache key."""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+
+    def _dumps(obj):
+        return json.dumps(obj, default=_json_default).encode("utf-8")
+
+    def _canonical(obj):
+        """Deterministic encoding of request params, used as a cache key."""
+        return json.dumps(obj, sort_keys=True, default=str)
+
+    _loads = json.loads
+
+
+# msgspec decodes straight into a typed struct, skipping the intermediate
+# dict for the envelope. Optional like orjson.
+try:
+    import msgspec
+
+    class _Request(msgspec.Struct):
+        id: object = None
+        command: str = ""
+        params: dict = {}
+        commands: object = None
+
+    _request_decoder = msgspec.json.Decoder(_Request)
+
+    def _decode_request(message):
+        """Decode a frame into (id, command, params, commands); ValueError if malformed."""
+        try:
+            req = _request_decoder.decode(message)
+        except msgspec.DecodeError as e:  # ValidationError subclasses this
+            raise ValueError(str(e)) from None
+        return req.id, req.command, req.params, req.commands
+except ImportError:
+    msgspec = None
+
+    def _decode_request(message):
+        """Decode a frame into (id, command, params, commands); ValueError if malformed."""
+        request = _loads(message)  # JSONDecodeError subclasses ValueError
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be an object")
+        return request.get("id"), request.get("command", ""), params, request.get("commands")
+
+
+def _frame_with_id(request_id, body):
+    """Splice an "id" member into an encoded JSON object."""
+    return b'{"id":' + _dumps(request_id) + b"," + body[1:]
+
+
+class _CacheableResult:
+    """A successful read-only result to encode on the I/O thread and cache."""
+
+    __slots__ = ("request_id", "result", "key", "generation")
+
+    def __init__(self, request_id, result, key, generation):
+        self.request_id = request_id
+        self.result = result
+        self.key = key
+        self.generation = generation
+
+
+class _Client:
+    """Per-connection buffers for the selector loop."""
+
+    __slots__ = ("sock", "inbuf", "scan", "outbuf", "pending", "writing")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.scan = 0  # inbuf[:scan] is known to contain no newline
+        self.outbuf = bytearray()
+        # Response slots in request order: [response or None, deadline]
+        self.pending = collections.deque()
+        self.writing = False
+
 
 class MCPTCPServer:
     """TCP server that bridges the MCP server process to Blender."""
@@ -24,6 +156,13 @@ class MCPTCPServer:
         self.port = port
         self.command_router = command_router
         self._server_socket = None
+        self._selector = None
+        self._clients = {}
+        self._completed = collections.deque()  # (slot, response) from any thread
+        self._response_cache = collections.OrderedDict()  # key -> (generation, body)
+        self._cache_generation = 0
+        self._wakeup_r = None  # socketpair: other threads write a byte to
+        self._wakeup_w = None  # interrupt select() (results ready / stop)
         self._thread = None
         self._running = False
 
@@ -34,125 +173,347 @@ class MCPTCPServer:
             return
 
         self._running = True
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
         self._thread = threading.Thread(target=self._run_server, daemon=True)
         self._thread.start()
-        logger.info(f"MCP TCP server started on {self.host}:{self.port}")
+        logger.info("MCP TCP server started on %s:%s", self.host, self.port)
 
     def stop(self):
         """Stop the TCP server."""
         self._running = False
-        if self._server_socket:
-            try:
-                self._server_socket.close()
-            except Exception:
-                pass
+        self._wake()
         if self._thread:
             self._thread.join(timeout=2.0)
+        for sock in (self._wakeup_r, self._wakeup_w):
+            if sock is not None:
+                sock.close()
+        self._wakeup_r = self._wakeup_w = None
         logger.info("MCP TCP server stopped")
 
+    def invalidate_response_cache(self):
+        """Drop cached read-only responses. Safe to call from any thread."""
+        self._cache_generation += 1
+
+    def _cached_body(self, key):
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] != self._cache_generation:
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        return entry[1]
+
+    def _encode(self, response):
+        """Encode a response (dict, pre-encoded bytes or _CacheableResult) as one frame."""
+        if isinstance(response, bytes):
+            return response
+        if isinstance(response, _CacheableResult):
+            body = _dumps(response.result)
+            if response.generation == self._cache_generation:
+                cache = self._response_cache
+                cache[response.key] = (response.generation, body)
+                cache.move_to_end(response.key)
+                if len(cache) > RESPONSE_CACHE_SIZE:
+                    cache.popitem(last=False)
+            return _frame_with_id(response.request_id, body)
+        return _dumps(response)
+
+    def _wake(self):
+        """Interrupt the I/O thread's select(). Safe to call from any thread."""
+        try:
+            self._wakeup_w.send(b"\0")
+        except (AttributeError, OSError):
+            pass  # Not started, already stopped, or buffer full (a wakeup is pending anyway)
+
     def _run_server(self):
-        """Main server loop — accepts connections and handles them."""
+        """Main server loop — accepts connections and services all clients."""
+        self._selector = selectors.DefaultSelector()
         try:
             self._server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self._server_socket.settimeout(1.0)  # Allow periodic check of _running
             self._server_socket.bind((self.host, self.port))
             self._server_socket.listen(5)
-            logger.info(f"Listening on {self.host}:{self.port}")
+            self._server_socket.setblocking(False)
+            self._selector.register(self._server_socket, selectors.EVENT_READ, None)
+            self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+            logger.info("Listening on %s:%s", self.host, self.port)
 
             while self._running:
-                try:
-                    client_socket, addr = self._server_socket.accept()
-                    logger.info(f"Connection from {addr}")
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client_socket,),
-                        daemon=True
-                    )
-                    client_thread.start()
-                except socket.timeout:
-                    continue  # Check _running flag
-                except OSError:
-                    if self._running:
-                        logger.error("Socket error in accept loop")
-                    break
+                for key, mask in self._selector.select(timeout=self._next_timeout()):
+                    if key.fileobj is self._wakeup_r:
+                        self._drain_wakeups()
+                        continue
+                    if key.data is None:
+                        self._accept()
+                        continue
+                    client = key.data
+                    try:
+                        if mask & selectors.EVENT_READ:
+                            self._read(client)
+                        if mask & selectors.EVENT_WRITE and client.sock.fileno() != -1:
+                            self._write(client)
+                    except Exception as e:
+                        # Only this client is affected; the others keep being served
+                        logger.exception("Error serving client: %s", e)
+                        self._close(client)
+                self._flush_responses()
 
         except Exception as e:
-            logger.error(f"TCP server error: {e}")
+            logger.error("TCP server error: %s", e)
         finally:
+            for client in list(self._clients.values()):
+                self._close(client)
             if self._server_socket:
                 try:
                     self._server_socket.close()
                 except Exception:
                     pass
+            self._selector.close()
 
-    def _handle_client(self, client_socket):
-        """Handle a single client connection — read commands, send responses."""
-        client_socket.settimeout(30.0)
-        buffer = ""
+    def _next_timeout(self):
+        """Seconds until the oldest pending response expires, or None to block."""
+        deadline = min(
+            (client.pending[0][1] for client in self._clients.values() if client.pending),
+            default=None,
+        )
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
 
+    def _drain_wakeups(self):
         try:
-            while self._running:
-                try:
-                    data = client_socket.recv(65536)
-                    if not data:
-                        break  # Client disconnected
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
 
-                    buffer += data.decode("utf-8")
+    def _accept(self):
+        try:
+            client_socket, addr = self._server_socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        logger.info("Connection from %s", addr)
+        client_socket.setblocking(False)
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = _Client(client_socket)
+        self._clients[client_socket] = client
+        self._selector.register(client_socket, selectors.EVENT_READ, client)
 
-                    # Process complete messages (newline-delimited)
-                    while "\n" in buffer:
-                        message, buffer = buffer.split("\n", 1)
-                        message = message.strip()
-                        if not message:
-                            continue
+    def _close(self, client):
+        self._clients.pop(client.sock, None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.sock.close()
+        except Exception:
+            pass
 
-                        response = self._process_message(message)
-                        response_bytes = (json.dumps(response) + "\n").encode("utf-8")
-                        client_socket.sendall(response_bytes)
+    def _read(self, client):
+        """Read what's available and dispatch every complete line."""
+        try:
+            data = client.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(client)  # Client disconnected
+            return
 
-                except socket.timeout:
-                    continue
-                except ConnectionResetError:
-                    break
+        client.inbuf += data
 
-        except Exception as e:
-            logger.error(f"Client handler error: {e}")
-        finally:
+        # Process complete messages (newline-delimited)
+        while True:
+            newline = client.inbuf.find(b"\n", client.scan)
+            if newline < 0:
+                client.scan = len(client.inbuf)
+                break
+            message = client.inbuf[:newline]  # The decoders accept a bytearray
+            del client.inbuf[:newline + 1]
+            client.scan = 0
+            if not message or message.isspace():
+                continue
+
+            slot = [None, time.monotonic() + COMMAND_TIMEOUT]
+            client.pending.append(slot)
+            respond = functools.partial(self._complete, slot)
             try:
-                client_socket.close()
-            except Exception:
-                pass
+                self._process_message(message, respond)
+            except Exception as e:
+                logger.exception("Error processing message: %s", e)
+                respond({"id": None, "status": "error", "error": f"Internal error: {e}"})
+
+    def _complete(self, slot, response):
+        """Hand a finished response to the I/O thread. Called from any thread."""
+        self._completed.append((slot, response))
+        if threading.current_thread() is not self._thread:
+            self._wake()
+
+    def _flush_responses(self):
+        """Move finished results into client buffers, preserving request order."""
+        while self._completed:
+            slot, response = self._completed.popleft()
+            slot[0] = response
+
+        now = time.monotonic()
+        for client in list(self._clients.values()):
+            pending = client.pending
+            while pending:
+                response, deadline = pending[0]
+                if response is None:
+                    if now < deadline:
+                        break
+                    response = {
+                        "status": "error",
+                        "error": f"Command timed out after {COMMAND_TIMEOUT}s"
+                    }
+                pending.popleft()
+                client.outbuf += self._encode(response) + b"\n"
+
+            if client.outbuf and not client.writing:
+                self._write(client)
+
+    def _write(self, client):
+        """Send as much buffered output as the socket accepts."""
+        try:
+            sent = client.sock.send(client.outbuf)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close(client)
+            return
+        del client.outbuf[:sent]
 
-    def _process_message(self, message):
-        """Parse a JSON message and dispatch to the command router."""
+        # Only watch for writability while there is something left to send
+        want_write = bool(client.outbuf)
+        if want_write != client.writing:
+            client.writing = want_write
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+            self._selector.modify(client.sock, events, client)
+
+    def _process_message(self, message, respond):
+        """Parse a JSON message and dispatch to the command router.
+
+        respond(response) is called exactly once, possibly later from
+        Blender's main thread.
+        """
         try:
-            request = json.loads(message)
-        except json.JSONDecodeError as e:
-            return {
+            request_id, command, params, commands = _decode_request(message)
+        except ValueError as e:
+            respond({
                 "id": None,
                 "status": "error",
                 "error": f"Invalid JSON: {e}"
-            }
+            })
+            return
 
-        request_id = request.get("id")
-        command = request.get("command")
-        params = request.get("params", {})
+        if commands is not None:
+            self._process_batch(request_id, commands, respond)
+            return
 
         if not command:
-            return {
+            respond({
                 "id": request_id,
                 "status": "error",
                 "error": "Missing 'command' field"
-            }
-
-        if self.command_router:
-            result = self.command_router.dispatch(command, params)
-            result["id"] = request_id
-            return result
-        else:
-            return {
+            })
+            return
+
+        if not isinstance(command, str):
+            respond({
+                "id": request_id,
+                "status": "error",
+                "error": "'command' must be a string"
+            })
+            return
+
+        if not self.command_router:
+            respond({
                 "id": request_id,
                 "status": "error",
                 "error": "No command router configured"
-            }
+            })
+            return
+
+        if command not in CACHEABLE_COMMANDS:
+            if self._may_change_scene(command):
+                # Nothing cached so far can be trusted
+                self.invalidate_response_cache()
+
+            def _done(result):
+                respond({"id": request_id, **result})
+
+            self.command_router.submit(command, params, _done)
+            return
+
+        key = (command, _canonical(params))
+        body = self._cached_body(key)
+        if body is not None:
+            respond(_frame_with_id(request_id, body))
+            return
+
+        generation = self._cache_generation
+
+        def _done_cacheable(result):
+            if result.get("status") == "success":
+                respond(_CacheableResult(request_id, result, key, generation))
+            else:
+                respond({"id": request_id, **result})
+
+        self.command_router.submit(command, params, _done_cacheable)
+
+    def _may_change_scene(self, command):
+        """Whether running `command` can make cached responses stale."""
+        return not (
+            command in CACHEABLE_COMMANDS
+            or command in READ_ONLY_COMMANDS
+            or self.command_router.is_direct(command)
+        )
+
+    def _process_batch(self, request_id, commands, respond):
+        """Dispatch a {"commands": [...]} frame as a single main-thread batch."""
+        if not isinstance(commands, list):
+            respond({
+                "id": request_id,
+                "status": "error",
+                "error": "'commands' must be a list"
+            })
+            return
+
+        for cmd in commands:
+            if not (
+                isinstance(cmd, dict)
+                and isinstance(cmd.get("command", ""), str)
+                and isinstance(cmd.get("params", {}), dict)
+            ):
+                respond({
+                    "id": request_id,
+                    "status": "error",
+                    "error": "Each entry in 'commands' must be an object with a string 'command' and object 'params'"
+                })
+                return
+
+        if not self.command_router:
+            respond({
+                "id": request_id,
+                "status": "error",
+                "error": "No command router configured"
+            })
+            return
+
+        def _done(results):
+            respond({
+                "id": request_id,
+                "status": "success",
+                "results": [{"id": cmd.get("id"), **result} for cmd, result in zip(commands, results)]
+            })
+
+        batch = [(cmd.get("command", ""), cmd.get("params", {})) for cmd in commands]
+        if any(self._may_change_scene(command) for command, _ in batch):
+            self.invalidate_response_cache()
+        self.command_router.submit_batch(batch, _done)
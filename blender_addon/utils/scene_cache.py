@@ -0,0 +1,101 @@
+"""
+Invalidation hooks for per-module scene lookup caches.
+
+Handlers cache things like "the armature" or "the head mesh" so they
+don't rescan bpy.context.scene.objects on every command. Those caches
+only go stale when objects are added to / removed from the scene, bones
+are edited, an undo/redo restores other data, or a new .blend file is
+loaded, so a single depsgraph handler watches for collection and
+armature-data changes and calls every registered invalidation callback
+(undo/redo and file loads invalidate unconditionally). Per-frame
+transform updates do not trigger invalidation.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+_callbacks = []
+_update_listeners = []
+
+
+def on_structure_change(func):
+    """Register `func()` to be called when the scene's object set may have changed.
+
+    Usable as a decorator. Returns `func` unchanged.
+    """
+    _callbacks.append(func)
+    return func
+
+
+def add_update_listener(func):
+    """Call `func()` after every depsgraph update and file load.
+
+    For caches of values (not just object identity) that any edit can
+    make stale. Listeners must be cheap and thread-agnostic.
+    """
+    if func not in _update_listeners:
+        _update_listeners.append(func)
+
+
+def remove_update_listener(func):
+    """Undo add_update_listener(). Unknown listeners are ignored."""
+    if func in _update_listeners:
+        _update_listeners.remove(func)
+
+
+def invalidate_all():
+    """Call every registered invalidation callback."""
+    for func in _callbacks:
+        func()
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    for func in _update_listeners:
+        func()
+
+    # Linking/unlinking objects always tags the owning collection; leaving
+    # edit mode tags the armature data and rebuilds its pose bones
+    for update in depsgraph.updates:
+        if isinstance(update.id, (bpy.types.Collection, bpy.types.Armature)):
+            invalidate_all()
+            return
+
+
+@persistent
+def _on_load_post(*args):
+    invalidate_all()
+    for func in _update_listeners:
+        func()
+
+
+@persistent
+def _on_undo_redo(*args):
+    # Undo/redo reloads scene data, so cached bpy references may be stale
+    # even when the object and bone counts still match
+    invalidate_all()
+    for func in _update_listeners:
+        func()
+
+
+def register():
+    """Install the bpy.app handlers. Call from the addon's register()."""
+    if _on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    if _on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_on_load_post)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_undo_redo not in handlers:
+            handlers.append(_on_undo_redo)
+
+
+def unregister():
+    """Remove the bpy.app handlers. Call from the addon's unregister()."""
+    if _on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_on_depsgraph_update)
+    if _on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_on_load_post)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _on_undo_redo in handlers:
+            handlers.remove(_on_undo_redo)
+    invalidate_all()
@@ -3,86 +3,188 @@ Thread-safe command execution for Blender.
 
 Blender's Python API (bpy) can only be called from the main thread.
 This module provides a queue-based system where:
-  1. TCP server thread puts commands into a queue
-  2. A bpy.app.timers callback on the main thread polls the queue
+  1. TCP server thread appends commands to a shared deque
+  2. A bpy.app.timers callback on the main thread drains the deque,
+     stopping after DRAIN_BUDGET seconds so bursts can't freeze the UI
   3. Commands execute on the main thread and results are stored
-  4. The TCP thread retrieves results via a thread-safe dict
+  4. The submitter either blocks on a per-command Event until its result
+     is ready, or is handed the result through a callback
+
+Commands can also be submitted as a batch: every command in the batch
+runs contiguously in the same timer tick and the results come back as
+a single list.
 """
 
-import queue
+import collections
+import itertools
 import threading
-import uuid
 import time
 import traceback
 
 
+def _execute(handler_func, params):
+    """Run a handler and normalize its return value into a result dict."""
+    try:
+        result = handler_func(params)
+        if not isinstance(result, dict):
+            result = {"status": "success", "result": result}
+    except Exception as e:
+        result = {
+            "status": "error",
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }
+    return result
+
+
 class CommandQueue:
     """Thread-safe command queue for bridging TCP thread <-> Blender main thread."""
 
+    # Timer interval backs off from MIN_INTERVAL to IDLE_INTERVAL (seconds)
+    # while the queue stays empty, so follow-up commands in a burst are
+    # picked up quickly and an idle addon polls at the old slow rate
+    MIN_INTERVAL = 0.005
+    IDLE_INTERVAL = 0.1
+
+    # Max seconds of work per timer tick; the rest runs on the next tick
+    # after Blender has had a chance to process UI events
+    DRAIN_BUDGET = 0.005
+
     def __init__(self):
-        self._command_queue = queue.Queue()
+        self._deque = collections.deque()
+        self._lock = threading.Lock()
+        # command_id -> [threading.Event, result]; the result slot is filled
+        # on the main thread just before the event is set
         self._results = {}
-        self._results_lock = threading.Lock()
+        self._ids = itertools.count(1)
         self._timer_registered = False
+        self._dirty_viewlayer = False
+        self._idle_ticks = 0
+
+    def _enqueue(self, handler_func, params, callback=None):
+        """Append one work item under a single lock acquisition and return its ID."""
+        command_id = next(self._ids)
+        with self._lock:
+            if callback is None:
+                self._results[command_id] = [threading.Event(), None]
+            self._deque.append((handler_func, params, command_id, callback))
+        return command_id
 
-    def submit_command(self, handler_func, params):
+    def submit_command(self, handler_func, params, callback=None):
         """Submit a command for execution on the main thread.
 
         Args:
             handler_func: Callable that takes (params) and returns a result dict.
             params: Dict of parameters to pass to the handler.
+            callback: Optional callable(result). When given, it is invoked on
+                      the main thread with the result and get_result() must
+                      not be used for this command.
 
         Returns:
-            str: Unique command ID to retrieve the result later.
+            int: Unique command ID to retrieve the result later.
         """
-        command_id = str(uuid.uuid4())
-        self._command_queue.put((command_id, handler_func, params))
-        return command_id
+        return self._enqueue(handler_func, params, callback)
+
+    def submit_batch(self, commands, callback=None):
+        """Submit several commands to run back-to-back in one main-thread tick.
+
+        Args:
+            commands: List of (handler_func, params) tuples.
+            callback: Optional callable(results), as for submit_command().
+
+        Returns:
+            int: Batch ID; get_result() returns a list of result dicts
+                 in the same order as `commands`.
+        """
+        return self._enqueue(None, list(commands), callback)
 
     def get_result(self, command_id, timeout=10.0):
         """Wait for and retrieve the result of a submitted command.
 
         Args:
-            command_id: The ID returned by submit_command.
+            command_id: The ID returned by submit_command or submit_batch.
             timeout: Max seconds to wait for the result.
 
         Returns:
-            dict: The result from the handler, or an error dict on timeout.
+            dict: The result from the handler (a list of dicts for batches),
+                  or an error dict on timeout.
+        """
+        with self._lock:
+            entry = self._results.get(command_id)
+        if entry is None or not entry[0].wait(timeout):
+            with self._lock:
+                self._results.pop(command_id, None)
+            return {"status": "error", "error": f"Command timed out after {timeout}s"}
+
+        with self._lock:
+            self._results.pop(command_id, None)
+        return entry[1]
+
+    def mark_dirty(self):
+        """Request a view layer update after the current drain.
+
+        Handlers call this instead of bpy.context.view_layer.update() so
+        N commands in one tick cost a single depsgraph evaluation.
+        Main thread only.
         """
-        start = time.time()
-        while time.time() - start < timeout:
-            with self._results_lock:
-                if command_id in self._results:
-                    return self._results.pop(command_id)
-            time.sleep(0.01)
-        return {"status": "error", "error": f"Command timed out after {timeout}s"}
+        self._dirty_viewlayer = True
+
+    def flush_dirty(self):
+        """Run the deferred view layer update now, if one is pending. Main thread only."""
+        if self._dirty_viewlayer:
+            self._dirty_viewlayer = False
+            import bpy
+            bpy.context.view_layer.update()
 
     def _process_queue(self):
-        """Process pending commands. Called by bpy.app.timers on the main thread."""
+        """Drain pending commands for up to DRAIN_BUDGET seconds.
+
+        Called by bpy.app.timers on the main thread. At least one item is
+        always processed, and a batch always runs to completion.
+        """
+        drained = bool(self._deque)
+        deadline = time.monotonic() + self.DRAIN_BUDGET
         try:
-            while not self._command_queue.empty():
-                try:
-                    command_id, handler_func, params = self._command_queue.get_nowait()
-                except queue.Empty:
+            while self._deque:
+                handler_func, params, command_id, callback = self._deque.popleft()
+
+                if handler_func is None:
+                    # Batch: params is a list of (handler, params) pairs
+                    result = [_execute(h, p) for h, p in params]
+                else:
+                    result = _execute(handler_func, params)
+
+                if callback is not None:
+                    try:
+                        callback(result)
+                    except Exception:
+                        pass
+                else:
+                    # A missing entry means the waiter already timed out
+                    with self._lock:
+                        entry = self._results.get(command_id)
+                    if entry is not None:
+                        entry[1] = result
+                        entry[0].set()
+
+                if time.monotonic() >= deadline:
                     break
-
-                try:
-                    result = handler_func(params)
-                    if not isinstance(result, dict):
-                        result = {"status": "success", "result": result}
-                except Exception as e:
-                    result = {
-                        "status": "error",
-                        "error": str(e),
-                        "traceback": traceback.format_exc()
-                    }
-
-                with self._results_lock:
-                    self._results[command_id] = result
         except Exception:
             pass  # Don't crash the timer
 
-        return 0.05  # Re-run every 50ms
+        try:
+            self.flush_dirty()
+        except Exception:
+            pass
+
+        # Work left over (budget spent or new arrivals) — run again immediately
+        if self._deque:
+            return 0.0
+        if drained:
+            self._idle_ticks = 0
+            return self.MIN_INTERVAL
+        self._idle_ticks = min(self._idle_ticks + 1, 16)
+        return min(self.IDLE_INTERVAL, self.MIN_INTERVAL * (2 ** self._idle_ticks))
 
     def start_timer(self):
         """Register the bpy.app.timers callback. Must be called from main thread."""
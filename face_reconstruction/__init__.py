@@ -15,6 +15,8 @@ Usage:
     # features = {"nose_width": 0.35, "jaw_width": -0.2, ...}
 """
 
-from .landmark_detector import detect_face_landmarks
+from .landmark_detector import detect_face_landmarks, detect_face_landmarks_batch, warm_up_landmarker
 from .proportion_analyzer import analyze_proportions
-from .feature_mapper import map_proportions_to_features, get_feature_confidence
+from .feature_mapper import (
+    map_proportions_to_features, map_proportions_to_feature_array, get_feature_confidence
+)
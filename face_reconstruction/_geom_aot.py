@@ -0,0 +1,24 @@
+"""
+Ahead-of-time build of the proportion-analysis kernels.
+
+Run `python -m face_reconstruction._geom_aot` (requires numba) to compile
+the `_face_geom` extension module next to this file. proportion_analyzer
+uses it when present, so the first analysis in a session doesn't pay for
+JIT compilation. This is an optional build step: numba's pycc is
+deprecated upstream, and the @njit versions remain the fallback.
+"""
+
+import os
+
+from numba.pycc import CC
+
+from .proportion_analyzer import _jaw_deviation
+
+cc = CC("_face_geom")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("jaw_deviation", "f8(f8[:], i8, i8, i8, i8, i8)")(_jaw_deviation.py_func)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,21 @@
+"""
+Optional numba support.
+
+numba is not a hard dependency (install the "jit" extra to enable it).
+Without it, `njit` returns the function unchanged and `prange` is
+`range`, so kernels still run as plain Python.
+"""
+
+try:
+    from numba import njit, prange
+
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
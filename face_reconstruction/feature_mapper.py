@@ -10,10 +10,18 @@ The mapping uses z-score normalization:
 Where mean and std come from reference_proportions.py (average face baseline).
 """
 
+import heapq
 import logging
+import math
 
+import numpy as np
+
+from ._jit import HAS_NUMBA, njit
 from .reference_proportions import (
     REFERENCE_PROPORTIONS,
+    REFERENCE_NAMES,
+    REFERENCE_MEANS,
+    REFERENCE_STDS,
     DEFAULT_SENSITIVITY,
     MEASUREMENT_CONFIDENCE,
 )
@@ -77,6 +85,40 @@ PROPORTION_TO_FEATURE = {
     "ear_angle":           "ear_angle_ratio",
 }
 
+# Column layout for the vectorized mapping: one slot per feature, with the
+# reference mean/std aligned to it (NaN mean / 0 std = no reference data).
+# FEATURE_NAMES is also the order of map_proportions_to_feature_array().
+FEATURE_NAMES = tuple(PROPORTION_TO_FEATURE)
+_RATIO_KEYS = tuple(PROPORTION_TO_FEATURE.values())
+_REF_INDEX = np.array(
+    [REFERENCE_NAMES.index(k) if k in REFERENCE_PROPORTIONS else -1 for k in _RATIO_KEYS],
+    dtype=np.intp,
+)
+_HAS_REF = _REF_INDEX >= 0
+_MEAN_ARR = np.where(_HAS_REF, REFERENCE_MEANS[_REF_INDEX], np.nan).astype(np.float32)
+_STD_ARR = np.where(_HAS_REF, REFERENCE_STDS[_REF_INDEX], 0.0).astype(np.float32)
+_CONFIDENCE_TUPLE = tuple(MEASUREMENT_CONFIDENCE.get(k, "low") for k in _RATIO_KEYS)
+
+# Display grouping for format_features_by_category()
+_CATEGORIES = (
+    ("Nose", ("nose_width", "nose_length", "nose_tip_height", "nose_bridge_width", "nose_bridge_height")),
+    ("Jaw", ("jaw_width", "jaw_height", "jaw_angle", "chin_prominence", "chin_width", "chin_height")),
+    ("Eyes", ("eye_size", "eye_spacing", "eye_tilt", "eye_depth")),
+    ("Brows", ("brow_height", "brow_arch", "brow_spacing")),
+    ("Lips", ("lip_fullness_upper", "lip_fullness_lower", "lip_width", "lip_height")),
+    ("Cheeks", ("cheekbone_height", "cheekbone_prominence", "cheek_fullness")),
+    ("Forehead", ("forehead_height", "forehead_width", "forehead_slope")),
+    ("Ears", ("ear_size", "ear_angle")),
+    ("Face Shape", ("face_width", "face_length")),
+)
+
+# Static pieces of the formatted output, built once
+_CATEGORY_LINES = tuple(
+    (f"\n=== {category} ===", tuple((name, f"  {name}: ") for name in names))
+    for category, names in _CATEGORIES
+)
+_CONFIDENCE_SUFFIX = {conf: f" [{conf}]" for conf in ("high", "medium", "low", "")}
+
 
 def map_proportions_to_features(
     proportions: dict,
@@ -95,41 +137,51 @@ def map_proportions_to_features(
         Dict mapping feature names to float values in [-1.0, 1.0].
         Example: {"nose_width": 0.35, "jaw_width": -0.2, ...}
     """
+    values = map_proportions_to_feature_array(proportions, sensitivity)
+    return dict(zip(FEATURE_NAMES, values.tolist()))
+
+
+def map_proportions_to_feature_array(
+    proportions: dict,
+    sensitivity: float = None,
+) -> np.ndarray:
+    """Array form of map_proportions_to_features().
+
+    Returns:
+        float32 array of feature values in [-1.0, 1.0], ordered as FEATURE_NAMES.
+    """
     if sensitivity is None:
         sensitivity = DEFAULT_SENSITIVITY
 
     if not proportions:
         logger.warning("Empty proportions dict — returning all zeros")
-        return {feature: 0.0 for feature in PROPORTION_TO_FEATURE}
+        return np.zeros(len(FEATURE_NAMES), dtype=np.float32)
 
-    features = {}
-    mapped_count = 0
-    defaulted_count = 0
-
-    for feature_name, ratio_key in PROPORTION_TO_FEATURE.items():
-        measured = proportions.get(ratio_key)
-
-        if measured is None:
-            features[feature_name] = 0.0
-            defaulted_count += 1
-            continue
+    measured = np.fromiter(
+        (np.nan if v is None else v for v in map(proportions.get, _RATIO_KEYS)),
+        dtype=np.float32, count=len(_RATIO_KEYS),
+    )
+    mapped = _HAS_REF & ~np.isnan(measured)
 
-        ref = REFERENCE_PROPORTIONS.get(ratio_key)
-        if ref is None:
-            features[feature_name] = 0.0
-            defaulted_count += 1
-            continue
+    # z-score / sensitivity, clamped; unmeasured or unreferenced features
+    # (and any with a non-positive std) default to 0.0
+    if HAS_NUMBA:
+        values = np.empty_like(measured)
+        _kernel_map(measured, _MEAN_ARR, _STD_ARR, float(sensitivity), values)
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.clip((measured - _MEAN_ARR) / (_STD_ARR * sensitivity), -1.0, 1.0)
+        values = np.where(mapped & (_STD_ARR > 0), values, 0.0)
 
-        mean, std = ref
-        features[feature_name] = _ratio_to_feature_value(measured, mean, std, sensitivity)
-        mapped_count += 1
+    mapped_count = int(mapped.sum())
+    defaulted_count = len(_RATIO_KEYS) - mapped_count
 
     logger.info(
         f"Mapped {mapped_count} features, {defaulted_count} defaulted to 0.0 "
         f"(sensitivity={sensitivity})"
     )
 
-    return features
+    return values
 
 
 def get_feature_confidence(proportions: dict = None) -> dict:
@@ -141,17 +193,14 @@ def get_feature_confidence(proportions: dict = None) -> dict:
           "medium" — derived from indirect measurements
           "low" — depth-based (z-axis) or defaulted
     """
-    result = {}
-    for feature_name, ratio_key in PROPORTION_TO_FEATURE.items():
-        conf = MEASUREMENT_CONFIDENCE.get(ratio_key, "low")
-
-        # If the proportion wasn't measured at all, it's low confidence
-        if proportions and proportions.get(ratio_key) is None:
-            conf = "low"
-
-        result[feature_name] = conf
+    if not proportions:
+        return dict(zip(FEATURE_NAMES, _CONFIDENCE_TUPLE))
 
-    return result
+    # If the proportion wasn't measured at all, it's low confidence
+    return {
+        name: conf if proportions.get(ratio_key) is not None else "low"
+        for name, ratio_key, conf in zip(FEATURE_NAMES, _RATIO_KEYS, _CONFIDENCE_TUPLE)
+    }
 
 
 def get_top_distinctive_features(features: dict, count: int = 5) -> list:
@@ -164,12 +213,8 @@ def get_top_distinctive_features(features: dict, count: int = 5) -> list:
     Returns:
         List of (feature_name, value) tuples sorted by |value| descending.
     """
-    sorted_features = sorted(
-        features.items(),
-        key=lambda x: abs(x[1]),
-        reverse=True
-    )
-    return sorted_features[:count]
+    # Same result (and tie order) as sorted(..., reverse=True)[:count]
+    return heapq.nlargest(count, features.items(), key=lambda x: abs(x[1]))
 
 
 def format_features_by_category(features: dict, confidence: dict = None) -> str:
@@ -182,33 +227,25 @@ def format_features_by_category(features: dict, confidence: dict = None) -> str:
     Returns:
         Formatted string with features grouped by category.
     """
-    categories = {
-        "Nose": ["nose_width", "nose_length", "nose_tip_height", "nose_bridge_width", "nose_bridge_height"],
-        "Jaw": ["jaw_width", "jaw_height", "jaw_angle", "chin_prominence", "chin_width", "chin_height"],
-        "Eyes": ["eye_size", "eye_spacing", "eye_tilt", "eye_depth"],
-        "Brows": ["brow_height", "brow_arch", "brow_spacing"],
-        "Lips": ["lip_fullness_upper", "lip_fullness_lower", "lip_width", "lip_height"],
-        "Cheeks": ["cheekbone_height", "cheekbone_prominence", "cheek_fullness"],
-        "Forehead": ["forehead_height", "forehead_width", "forehead_slope"],
-        "Ears": ["ear_size", "ear_angle"],
-        "Face Shape": ["face_width", "face_length"],
-    }
-
     lines = []
-    for category, feature_names in categories.items():
-        lines.append(f"\n=== {category} ===")
-        for name in feature_names:
-            val = features.get(name, 0.0)
+    append = lines.append
+    get_value = features.get
+    suffixes = _CONFIDENCE_SUFFIX
+
+    for header, entries in _CATEGORY_LINES:
+        append(header)
+        for name, prefix in entries:
+            val = get_value(name, 0.0)
             conf_str = ""
             if confidence:
                 conf = confidence.get(name, "")
-                conf_str = f" [{conf}]"
-            direction = "+" if val > 0 else ""
-            lines.append(f"  {name}: {direction}{val:.3f}{conf_str}")
+                conf_str = suffixes.get(conf) or f" [{conf}]"
+            append(f"{prefix}{'+' if val > 0 else ''}{val:.3f}{conf_str}")
 
     return "\n".join(lines)
 
 
+@njit(cache=True)
 def _ratio_to_feature_value(measured, mean, std, sensitivity):
     """Convert a measured ratio to a [-1, 1] feature value.
 
@@ -224,3 +261,14 @@ def _ratio_to_feature_value(measured, mean, std, sensitivity):
 
     # Clamp to [-1.0, 1.0]
     return max(-1.0, min(1.0, value))
+
+
+@njit(cache=True)
+def _kernel_map(measured_arr, mean_arr, std_arr, sensitivity, out):
+    """Fill `out` with _ratio_to_feature_value for each slot; NaN inputs map to 0.0."""
+    for i in range(measured_arr.shape[0]):
+        measured = measured_arr[i]
+        if math.isnan(measured) or math.isnan(mean_arr[i]):
+            out[i] = 0.0
+        else:
+            out[i] = _ratio_to_feature_value(measured, mean_arr[i], std_arr[i], sensitivity)
@@ -11,8 +11,16 @@ MediaPipe FaceLandmarker coordinates:
 """
 
 import os
+import atexit
+import hashlib
 import logging
+import threading
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import numpy as np
 
 logger = logging.getLogger("face_reconstruction.landmark_detector")
 
@@ -22,21 +30,90 @@ MODEL_URL = (
     "https://storage.googleapis.com/mediapipe-models/"
     "face_landmarker/face_landmarker/float16/1/face_landmarker.task"
 )
+# Optional SHA-256 of the model file; when set, downloads are verified against it
+MODEL_SHA256 = os.environ.get("FACE_LANDMARKER_SHA256") or None
+
+# Photos larger than this (longest side, pixels) are downscaled before detection
+MAX_IMAGE_SIDE = 1024
+
+# FaceLandmarker instances are reused: creating one reloads the model and
+# initializes the graph, which costs far more than a single detect(). An
+# instance serves one detect() at a time, so concurrent callers each check
+# one out of this pool, which grows to the peak concurrency.
+_IDLE_LANDMARKERS = []
+_LANDMARKER_LOCK = threading.Lock()
+_GPU_UNAVAILABLE = False
+
+# Set once the model file is known to exist, so later calls skip the stat()
+_MODEL_READY = False
+_MODEL_LOCK = threading.Lock()
 
 
 def _ensure_model():
     """Download the face landmarker model if it doesn't exist."""
-    if os.path.isfile(MODEL_PATH):
+    global _MODEL_READY
+    if _MODEL_READY:
         return True
+    with _MODEL_LOCK:  # Batch detection may get here from several threads
+        if os.path.isfile(MODEL_PATH):
+            _MODEL_READY = True
+            return True
+        try:
+            logger.info(f"Downloading face landmarker model ({MODEL_URL})...")
+            _download_model()
+            size_mb = os.path.getsize(MODEL_PATH) / (1024 * 1024)
+            logger.info(f"Downloaded face landmarker model ({size_mb:.1f} MB)")
+            _MODEL_READY = True
+            return True
+        except Exception as e:
+            logger.error(f"Failed to download model: {e}")
+            return False
+
+
+def _download_model():
+    """Fetch MODEL_URL into MODEL_PATH, resuming a partial earlier download.
+
+    Bytes go to a ".part" file next to the model, which is checked (length,
+    and SHA-256 when MODEL_SHA256 is set) and only then renamed into place,
+    so an interrupted or corrupt download never looks like a model.
+    """
+    part_path = MODEL_PATH + ".part"
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+
+    request = urllib.request.Request(MODEL_URL)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
     try:
-        logger.info(f"Downloading face landmarker model ({MODEL_URL})...")
-        urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
-        size_mb = os.path.getsize(MODEL_PATH) / (1024 * 1024)
-        logger.info(f"Downloaded face landmarker model ({size_mb:.1f} MB)")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to download model: {e}")
-        return False
+        response = urllib.request.urlopen(request, timeout=60)
+    except urllib.error.HTTPError as e:
+        if e.code == 416:
+            os.remove(part_path)  # Partial file doesn't fit the remote one; restart next time
+        raise
+    with response:
+        if offset and response.status != 206:
+            offset = 0  # Server ignored the Range header; start over
+        remaining = response.headers.get("Content-Length")
+        expected_size = offset + int(remaining) if remaining is not None else None
+        if offset:
+            logger.info(f"Resuming model download at {offset} bytes")
+        with open(part_path, "ab" if offset else "wb") as f:
+            while chunk := response.read(1 << 16):
+                f.write(chunk)
+
+    actual_size = os.path.getsize(part_path)
+    if expected_size is not None and actual_size != expected_size:
+        raise IOError(f"Incomplete download: {actual_size} of {expected_size} bytes")
+
+    if MODEL_SHA256:
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        if digest.hexdigest() != MODEL_SHA256.lower():
+            os.remove(part_path)
+            raise IOError("Downloaded model failed SHA-256 verification")
+
+    os.replace(part_path, MODEL_PATH)
 
 
 def detect_face_landmarks(image_path: str) -> dict:
@@ -49,7 +126,7 @@ def detect_face_landmarks(image_path: str) -> dict:
     Returns:
         dict with keys:
             success: bool — whether a face was detected
-            landmarks: list of (x, y, z) tuples — 478 normalized coordinates
+            landmarks: float32 array of shape (478, 3) — normalized (x, y, z) coordinates
             confidence: float — face detection confidence [0, 1]
             image_width: int — original image width in pixels
             image_height: int — original image height in pixels
@@ -86,12 +163,31 @@ def detect_face_landmarks(image_path: str) -> dict:
         return _error_result(
             "MediaPipe not installed. Run: pip install mediapipe"
         )
+    try:
+        import cv2
+    except ImportError:
+        return _error_result(
+            "OpenCV not installed. Run: pip install opencv-python"
+        )
 
-    # Load image using MediaPipe's own Image class
+    # Decode with OpenCV and shrink large photos before handing them to
+    # MediaPipe, which runs the model at a much lower resolution anyway.
+    # Landmarks are normalized, so image_width/height stay the originals.
     try:
-        mp_image = mp.Image.create_from_file(image_path)
-        image_width = mp_image.width
-        image_height = mp_image.height
+        image = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("unrecognized or corrupt image data")
+        image_height, image_width = image.shape[:2]
+        longest = max(image_width, image_height)
+        if longest > MAX_IMAGE_SIDE:
+            scale = MAX_IMAGE_SIDE / longest
+            image = cv2.resize(
+                image,
+                (max(1, round(image_width * scale)), max(1, round(image_height * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
     except Exception as e:
         return _error_result(
             f"Could not read image: {image_path}. "
@@ -100,20 +196,16 @@ def detect_face_landmarks(image_path: str) -> dict:
 
     logger.info(f"Loaded image: {image_width}x{image_height} from {image_path}")
 
-    # Configure FaceLandmarker
-    options = vision.FaceLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=MODEL_PATH),
-        running_mode=vision.RunningMode.IMAGE,
-        num_faces=1,
-        min_face_detection_confidence=0.5,
-        min_face_presence_confidence=0.5,
-        output_face_blendshapes=False,
-        output_facial_transformation_matrixes=False,
-    )
-
     # Run detection
-    with vision.FaceLandmarker.create_from_options(options) as landmarker:
+    try:
+        landmarker = _checkout_landmarker(BaseOptions, vision)
+    except Exception as e:
+        return _error_result(f"Could not create face landmarker: {e}")
+    try:
         result = landmarker.detect(mp_image)
+    finally:
+        with _LANDMARKER_LOCK:
+            _IDLE_LANDMARKERS.append(landmarker)
 
     # Check if face was detected
     if not result.face_landmarks or len(result.face_landmarks) == 0:
@@ -127,10 +219,10 @@ def detect_face_landmarks(image_path: str) -> dict:
 
     # Extract landmarks from the first detected face
     face_landmarks = result.face_landmarks[0]
-    landmarks = []
-
-    for lm in face_landmarks:
-        landmarks.append((lm.x, lm.y, lm.z))
+    landmarks = np.fromiter(
+        chain.from_iterable((lm.x, lm.y, lm.z) for lm in face_landmarks),
+        dtype=np.float32, count=3 * len(face_landmarks),
+    ).reshape(-1, 3)
 
     # Estimate detection confidence
     confidence = _estimate_confidence(landmarks, image_width, image_height)
@@ -154,6 +246,85 @@ def detect_face_landmarks(image_path: str) -> dict:
     }
 
 
+def detect_face_landmarks_batch(image_paths, max_workers=4):
+    """Detect face landmarks in several photos concurrently.
+
+    MediaPipe releases the GIL during inference, so images are processed
+    in parallel on a thread pool, each thread using its own landmarker.
+
+    Args:
+        image_paths: List of photo paths.
+        max_workers: Maximum number of images processed at once.
+
+    Returns:
+        List of detect_face_landmarks() result dicts, in input order.
+    """
+    if not image_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(image_paths))) as pool:
+        return list(pool.map(detect_face_landmarks, image_paths))
+
+
+def warm_up_landmarker():
+    """Download the model and create a pooled landmarker ahead of the first photo.
+
+    Returns:
+        bool: True if a landmarker is ready in the pool.
+    """
+    if not _ensure_model():
+        return False
+    try:
+        from mediapipe.tasks.python import BaseOptions, vision
+    except ImportError:
+        return False
+    try:
+        landmarker = _checkout_landmarker(BaseOptions, vision)
+    except Exception as e:
+        logger.warning(f"Could not create face landmarker: {e}")
+        return False
+    with _LANDMARKER_LOCK:
+        _IDLE_LANDMARKERS.append(landmarker)
+    return True
+
+
+def _checkout_landmarker(BaseOptions, vision):
+    """Take an idle FaceLandmarker from the pool, creating one if none is free.
+
+    The caller must put it back in _IDLE_LANDMARKERS when done.
+    """
+    global _GPU_UNAVAILABLE
+    with _LANDMARKER_LOCK:
+        if _IDLE_LANDMARKERS:
+            return _IDLE_LANDMARKERS.pop()
+
+    def create(delegate):
+        options = vision.FaceLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=MODEL_PATH, delegate=delegate),
+            running_mode=vision.RunningMode.IMAGE,
+            num_faces=1,
+            min_face_detection_confidence=0.5,
+            min_face_presence_confidence=0.5,
+            output_face_blendshapes=False,
+            output_facial_transformation_matrixes=False,
+        )
+        return vision.FaceLandmarker.create_from_options(options)
+
+    # Prefer the GPU delegate; it isn't available on every platform/build
+    landmarker = None
+    if not _GPU_UNAVAILABLE:
+        try:
+            landmarker = create(BaseOptions.Delegate.GPU)
+            logger.info("Created face landmarker (GPU delegate)")
+        except Exception as e:
+            logger.info(f"GPU delegate unavailable ({e}), using CPU")
+            _GPU_UNAVAILABLE = True
+    if landmarker is None:
+        landmarker = create(BaseOptions.Delegate.CPU)
+        logger.info("Created face landmarker (CPU delegate)")
+    atexit.register(landmarker.close)
+    return landmarker
+
+
 def _estimate_confidence(landmarks, image_width, image_height):
     """Estimate detection confidence based on landmark quality.
 
@@ -162,29 +333,31 @@ def _estimate_confidence(landmarks, image_width, image_height):
       - Landmarks should be within image bounds
       - Face should be roughly symmetric
     """
-    if not landmarks or len(landmarks) < 468:
+    if landmarks is None or len(landmarks) < 468:
         return 0.3
 
+    pts = np.asarray(landmarks)
+    xs = pts[:, 0]
+    ys = pts[:, 1]
+
     # Check face coverage
-    xs = [lm[0] for lm in landmarks]
-    ys = [lm[1] for lm in landmarks]
-    face_width_norm = max(xs) - min(xs)
-    face_height_norm = max(ys) - min(ys)
+    face_width_norm = float(xs.max() - xs.min())
+    face_height_norm = float(ys.max() - ys.min())
     face_area = face_width_norm * face_height_norm
 
     # Face should cover at least 5% of image for good detection
     coverage_score = min(1.0, face_area / 0.05)
 
     # Check that landmarks are within bounds (some small overflow is ok)
-    in_bounds = sum(1 for x, y, z in landmarks if -0.05 <= x <= 1.05 and -0.05 <= y <= 1.05)
-    bounds_score = in_bounds / len(landmarks)
+    in_bounds = int(np.count_nonzero((xs >= -0.05) & (xs <= 1.05) & (ys >= -0.05) & (ys <= 1.05)))
+    bounds_score = in_bounds / len(pts)
 
     # Check rough symmetry using eye landmarks
     # Left eye: 33 (outer), 133 (inner)
     # Right eye: 263 (outer), 362 (inner)
-    left_eye_x = (landmarks[33][0] + landmarks[133][0]) / 2
-    right_eye_x = (landmarks[263][0] + landmarks[362][0]) / 2
-    nose_x = landmarks[4][0]  # Nose tip
+    left_eye_x = float(pts[33, 0] + pts[133, 0]) / 2
+    right_eye_x = float(pts[263, 0] + pts[362, 0]) / 2
+    nose_x = float(pts[4, 0])  # Nose tip
 
     # Eyes should be roughly equidistant from nose
     left_dist = abs(nose_x - left_eye_x)
@@ -206,7 +379,7 @@ def _error_result(error_msg):
     logger.error(error_msg)
     return {
         "success": False,
-        "landmarks": [],
+        "landmarks": np.empty((0, 3), dtype=np.float32),
         "confidence": 0.0,
         "image_width": 0,
         "image_height": 0,
@@ -11,6 +11,12 @@ semantic layer's 32 facial features.
 
 import math
 import logging
+from itertools import chain
+from operator import itemgetter
+
+import numpy as np
+
+from ._jit import njit
 
 logger = logging.getLogger("face_reconstruction.proportion_analyzer")
 
@@ -83,118 +89,171 @@ LM = {
 }
 
 
-def analyze_proportions(landmarks: list) -> dict:
+# === MEASUREMENT TABLES ===
+# Every measurement below is a linear combination of landmark coordinates
+# (plus a hypot for distances), so analyze_proportions() evaluates them all
+# with one matrix product instead of measuring landmarks one pair at a time.
+# A landmark spec is a name or a tuple of names, which stands for their mean.
+
+# (name, a, b): 2D distance between a and b, / IPD.
+# Names starting with "_" are intermediates combined below, not ratios.
+_DISTANCES = (
+    # IPD: between the eye centers (midpoints of outer and inner corners)
+    ("_ipd", ("left_eye_outer", "left_eye_inner"), ("right_eye_outer", "right_eye_inner")),
+    ("nose_width_ratio", "nostril_left", "nostril_right"),
+    ("nose_length_ratio", "nose_bridge_top", "nose_tip"),
+    ("nose_bridge_width_ratio", "nose_bridge_left", "nose_bridge_right"),
+    ("jaw_width_ratio", "jaw_left", "jaw_right"),
+    ("chin_width_ratio", "chin_left", "chin_right"),
+    ("chin_height_ratio", "chin_center", "chin_bottom"),
+    ("_left_eye_height", "left_eye_upper", "left_eye_lower"),
+    ("_right_eye_height", "right_eye_upper", "right_eye_lower"),
+    ("eye_spacing_ratio", "left_eye_inner", "right_eye_inner"),
+    ("_left_brow_height", "left_brow_inner", "left_eye_inner"),
+    ("_right_brow_height", "right_brow_inner", "right_eye_inner"),
+    ("brow_spacing_ratio", "left_brow_inner", "right_brow_inner"),
+    ("lip_upper_ratio", "upper_lip_vermillion", "lip_top_center"),
+    ("lip_lower_ratio", "upper_lip_vermillion", "lip_bottom_center"),
+    ("lip_width_ratio", "lip_left_corner", "lip_right_corner"),
+    ("cheekbone_prominence_ratio", "cheek_left", "cheek_right"),
+    ("forehead_width_ratio", "left_brow_outer", "right_brow_outer"),
+    ("face_width_ratio", "jaw_left", "jaw_right"),
+    ("face_length_ratio", "forehead_top", "chin_bottom"),
+)
+
+# (name, axis, a, b, per_ipd): a - b along one axis (1 = y, 2 = z),
+# divided by IPD when per_ipd is set.
+_OFFSETS = (
+    ("nose_tip_height_ratio", 2, "nose_tip", "nose_bridge_top", False),
+    # Bridge height: how much the bridge protrudes (z relative to eye plane)
+    ("nose_bridge_height_ratio", 2, ("left_eye_inner", "right_eye_inner"), "nose_bridge_top", False),
+    # Jaw height: vertical distance from jaw angle midpoint to chin
+    ("jaw_height_ratio", 1, "chin_bottom", ("jaw_left", "jaw_right"), True),
+    # Chin prominence: z forward projection
+    ("chin_prominence_ratio", 2, "chin_center", "nose_tip", False),
+    # Eye tilt: outer-minus-inner corner height, averaged over both eyes
+    # (positive = outer corners higher, i.e. upward tilt)
+    ("eye_tilt_ratio", 1, ("left_eye_outer", "right_eye_inner"), ("left_eye_inner", "right_eye_outer"), False),
+    # Eye depth: how deep-set the eyes are (z relative to nose root)
+    ("eye_depth_ratio", 2, ("left_eye_inner", "right_eye_inner"), "nose_root", False),
+    # Brow arch: how much the brow mids peak above the inner-outer lines
+    ("brow_arch_ratio", 1,
+     ("left_brow_inner", "left_brow_outer", "right_brow_inner", "right_brow_outer"),
+     ("left_brow_mid", "right_brow_mid"), True),
+    # Lip vertical position (relative to the nose tip)
+    ("lip_height_ratio", 1, ("lip_top_center", "lip_bottom_center"), "nose_tip", True),
+    # Cheekbone height: relative to eye level (positive = lower)
+    ("cheekbone_height_ratio", 1, ("cheek_left", "cheek_right"), ("left_eye_inner", "right_eye_inner"), True),
+    # Cheek fullness: z-depth of mid-cheek area relative to the eyes
+    ("cheek_fullness_ratio", 2, ("cheek_upper_left", "cheek_upper_right"), ("left_eye_inner", "right_eye_inner"), False),
+    # Forehead height: from top of head to brow line (absolute value taken below)
+    ("forehead_height_ratio", 1, "forehead_top", ("left_brow_inner", "right_brow_inner"), True),
+    # Forehead slope: z-depth change from top to glabella
+    ("forehead_slope_ratio", 2, "forehead_top", "glabella", False),
+)
+
+
+# Jaw angle is not linear in the coordinates; _jaw_deviation() measures it
+# from the same gathered coordinates.
+_JAW_LANDMARKS = ("jaw_angle_left", "jaw_left", "jaw_angle_right", "jaw_right", "chin_bottom")
+
+
+def _spec_names(spec):
+    return (spec,) if isinstance(spec, str) else spec
+
+
+def _build_tables():
+    """Gather list and coefficient matrix for _DISTANCES and _OFFSETS.
+
+    Rows of the matrix are [dx of each distance, dy of each distance,
+    each offset]; columns are (x, y, z) of each used landmark in turn.
+    """
+    specs = [spec for row in _DISTANCES for spec in row[1:]] + [spec for row in _OFFSETS for spec in row[2:4]]
+    specs += _JAW_LANDMARKS
+    used = sorted({LM[name] for spec in specs for name in _spec_names(spec)})
+    column = {lm_idx: 3 * pos for pos, lm_idx in enumerate(used)}
+
+    n = len(_DISTANCES)
+    matrix = np.zeros((2 * n + len(_OFFSETS), 3 * len(used)))
+
+    def add(row, axis, spec, sign):
+        names = _spec_names(spec)
+        for name in names:
+            matrix[row, column[LM[name]] + axis] += sign / len(names)
+
+    for i, (_, a, b) in enumerate(_DISTANCES):
+        for axis in (0, 1):
+            add(axis * n + i, axis, a, 1.0)
+            add(axis * n + i, axis, b, -1.0)
+    for i, (_, axis, a, b, _) in enumerate(_OFFSETS):
+        add(2 * n + i, axis, a, 1.0)
+        add(2 * n + i, axis, b, -1.0)
+
+    return used, matrix, tuple(column[LM[name]] for name in _JAW_LANDMARKS)
+
+
+_USED, _MATRIX, _JAW_COLUMNS = _build_tables()
+_USED_ARR = np.array(_USED, dtype=np.intp)
+_gather_used = itemgetter(*_USED)
+_N_DIST = len(_DISTANCES)
+_DIST_NAMES = tuple(row[0] for row in _DISTANCES)
+_IPD_IDX = _DIST_NAMES.index("_ipd")
+_FACE_LENGTH_IDX = _DIST_NAMES.index("face_length_ratio")
+_OFFSET_NAMES = tuple(row[0] for row in _OFFSETS)
+_OFFSET_PER_IPD = np.array([row[4] for row in _OFFSETS], dtype=bool)
+
+
+def analyze_proportions(landmarks) -> dict:
     """Compute facial proportion ratios from 478 MediaPipe landmarks.
 
     All distances are normalized to IPD (inter-pupil distance) for
     scale-invariant measurements.
 
     Args:
-        landmarks: List of (x, y, z) tuples from detect_face_landmarks().
+        landmarks: (N, 3) array from detect_face_landmarks(), or an
+                   equivalent list of (x, y, z) tuples.
 
     Returns:
         Dict of named proportion ratios (all floats).
     """
-    if not landmarks or len(landmarks) < 468:
-        logger.error(f"Insufficient landmarks: {len(landmarks) if landmarks else 0}")
+    if landmarks is None or len(landmarks) < 468:
+        logger.error(f"Insufficient landmarks: {len(landmarks) if landmarks is not None else 0}")
         return {}
 
-    # Convenience accessor
-    def lm(idx):
-        return landmarks[idx]
+    if isinstance(landmarks, np.ndarray):
+        coords = landmarks[_USED_ARR].astype(np.float64).ravel()
+    else:
+        coords = np.fromiter(chain.from_iterable(_gather_used(landmarks)), dtype=np.float64, count=3 * len(_USED))
+
+    values = _MATRIX @ coords
+    n = _N_DIST
+    dists = np.hypot(values[:n], values[n:2 * n])
 
-    # Compute IPD (inter-pupil distance) as the normalization reference
-    ipd = _compute_ipd(landmarks)
+    # IPD (inter-pupil distance) is the normalization reference
+    ipd = float(dists[_IPD_IDX])
     if ipd < 0.001:
         logger.error("IPD is too small — face detection may be unreliable")
         return {}
 
     logger.info(f"IPD = {ipd:.4f} (normalized units)")
 
-    props = {}
+    face_height = dists[_FACE_LENGTH_IDX]
+    dists /= ipd
+    offsets = values[2 * n:]
+    offsets[_OFFSET_PER_IPD] /= ipd
 
-    # === NOSE ===
-    props["nose_width_ratio"] = _dist2d(lm(LM["nostril_left"]), lm(LM["nostril_right"])) / ipd
-    props["nose_length_ratio"] = _dist2d(lm(LM["nose_bridge_top"]), lm(LM["nose_tip"])) / ipd
-    props["nose_tip_height_ratio"] = lm(LM["nose_tip"])[2] - lm(LM["nose_bridge_top"])[2]  # z difference
-    props["nose_bridge_width_ratio"] = _dist2d(lm(LM["nose_bridge_left"]), lm(LM["nose_bridge_right"])) / ipd
-    # Bridge height: how much the bridge protrudes (z relative to eye plane)
-    eye_mid_z = (lm(LM["left_eye_inner"])[2] + lm(LM["right_eye_inner"])[2]) / 2
-    props["nose_bridge_height_ratio"] = eye_mid_z - lm(LM["nose_bridge_top"])[2]
+    measured = dict(zip(_DIST_NAMES, dists.tolist()))
+    props = {name: value for name, value in measured.items() if name[0] != "_"}
+    props.update(zip(_OFFSET_NAMES, offsets.tolist()))
 
-    # === JAW ===
-    props["jaw_width_ratio"] = _dist2d(lm(LM["jaw_left"]), lm(LM["jaw_right"])) / ipd
-    # Jaw height: vertical distance from jaw angle midpoint to chin
-    jaw_mid_y = (lm(LM["jaw_left"])[1] + lm(LM["jaw_right"])[1]) / 2
-    props["jaw_height_ratio"] = (lm(LM["chin_bottom"])[1] - jaw_mid_y) / ipd
-    # Jaw angle: compare jaw angle position to jaw corners and chin
-    props["jaw_angle_ratio"] = _compute_jaw_angle(landmarks, ipd)
-    # Chin
-    props["chin_prominence_ratio"] = lm(LM["chin_center"])[2] - lm(LM["nose_tip"])[2]  # z forward projection
-    props["chin_width_ratio"] = _dist2d(lm(LM["chin_left"]), lm(LM["chin_right"])) / ipd
-    props["chin_height_ratio"] = _dist2d(lm(LM["chin_center"]), lm(LM["chin_bottom"])) / ipd
-
-    # === EYES ===
-    left_eye_h = _dist2d(lm(LM["left_eye_upper"]), lm(LM["left_eye_lower"]))
-    right_eye_h = _dist2d(lm(LM["right_eye_upper"]), lm(LM["right_eye_lower"]))
-    props["eye_height_ratio"] = ((left_eye_h + right_eye_h) / 2) / ipd
-    props["eye_spacing_ratio"] = _dist2d(lm(LM["left_eye_inner"]), lm(LM["right_eye_inner"])) / ipd
-    # Eye tilt: height difference between outer and inner corners
-    left_tilt = lm(LM["left_eye_outer"])[1] - lm(LM["left_eye_inner"])[1]
-    right_tilt = lm(LM["right_eye_inner"])[1] - lm(LM["right_eye_outer"])[1]
-    props["eye_tilt_ratio"] = (left_tilt + right_tilt) / 2  # positive = outer corners higher (upward tilt)
-    # Eye depth: how deep-set the eyes are (z relative to nose bridge)
-    eye_z = (lm(LM["left_eye_inner"])[2] + lm(LM["right_eye_inner"])[2]) / 2
-    props["eye_depth_ratio"] = eye_z - lm(LM["nose_root"])[2]
-
-    # === BROWS ===
-    # Brow height: distance from brow to eye
-    left_brow_h = _dist2d(lm(LM["left_brow_inner"]), lm(LM["left_eye_inner"]))
-    right_brow_h = _dist2d(lm(LM["right_brow_inner"]), lm(LM["right_eye_inner"]))
-    props["brow_height_ratio"] = ((left_brow_h + right_brow_h) / 2) / ipd
-    # Brow arch: how much the brow mid peaks above the inner-outer line
-    props["brow_arch_ratio"] = _compute_brow_arch(landmarks, ipd)
-    # Brow spacing: distance between inner brow points
-    props["brow_spacing_ratio"] = _dist2d(lm(LM["left_brow_inner"]), lm(LM["right_brow_inner"])) / ipd
-
-    # === LIPS ===
-    # Upper lip thickness: vermillion to top of lip
-    props["lip_upper_ratio"] = _dist2d(lm(LM["upper_lip_vermillion"]), lm(LM["lip_top_center"])) / ipd
-    # Lower lip thickness: vermillion to bottom of lip
-    props["lip_lower_ratio"] = _dist2d(lm(LM["upper_lip_vermillion"]), lm(LM["lip_bottom_center"])) / ipd
-    # Lip width
-    props["lip_width_ratio"] = _dist2d(lm(LM["lip_left_corner"]), lm(LM["lip_right_corner"])) / ipd
-    # Lip vertical position (relative position between nose and chin)
-    lip_center_y = (lm(LM["lip_top_center"])[1] + lm(LM["lip_bottom_center"])[1]) / 2
-    face_height = _dist2d(lm(LM["forehead_top"]), lm(LM["chin_bottom"]))
-    if face_height > 0.001:
-        props["lip_height_ratio"] = (lip_center_y - lm(LM["nose_tip"])[1]) / ipd
-    else:
+    props["eye_height_ratio"] = (measured["_left_eye_height"] + measured["_right_eye_height"]) / 2
+    props["brow_height_ratio"] = (measured["_left_brow_height"] + measured["_right_brow_height"]) / 2
+    props["forehead_height_ratio"] = abs(props["forehead_height_ratio"])
+    if face_height <= 0.001:
         props["lip_height_ratio"] = 0.32
 
-    # === CHEEKS ===
-    # Cheekbone height: relative to eye level
-    eye_center_y = (lm(LM["left_eye_inner"])[1] + lm(LM["right_eye_inner"])[1]) / 2
-    cheek_y = (lm(LM["cheek_left"])[1] + lm(LM["cheek_right"])[1]) / 2
-    props["cheekbone_height_ratio"] = (cheek_y - eye_center_y) / ipd  # positive = lower
-    # Cheekbone prominence: lateral extent
-    props["cheekbone_prominence_ratio"] = _dist2d(lm(LM["cheek_left"]), lm(LM["cheek_right"])) / ipd
-    # Cheek fullness: z-depth of mid-cheek area
-    cheek_z = (lm(LM["cheek_upper_left"])[2] + lm(LM["cheek_upper_right"])[2]) / 2
-    props["cheek_fullness_ratio"] = cheek_z - eye_mid_z
-
-    # === FOREHEAD ===
-    # Forehead height: from top of head to brow line
-    brow_mid_y = (lm(LM["left_brow_inner"])[1] + lm(LM["right_brow_inner"])[1]) / 2
-    props["forehead_height_ratio"] = abs(lm(LM["forehead_top"])[1] - brow_mid_y) / ipd
-    # Forehead width: approximated from outer brow points
-    props["forehead_width_ratio"] = _dist2d(lm(LM["left_brow_outer"]), lm(LM["right_brow_outer"])) / ipd
-    # Forehead slope: z-depth change from top to glabella
-    props["forehead_slope_ratio"] = lm(LM["forehead_top"])[2] - lm(LM["glabella"])[2]
-
-    # === FACE SHAPE ===
-    props["face_width_ratio"] = _dist2d(lm(LM["jaw_left"]), lm(LM["jaw_right"])) / ipd
-    props["face_length_ratio"] = _dist2d(lm(LM["forehead_top"]), lm(LM["chin_bottom"])) / ipd
+    # Jaw angle: compare jaw angle position to jaw corners and chin
+    props["jaw_angle_ratio"] = _jaw_kernel(coords, *_JAW_COLUMNS) / ipd
 
     # === EARS (defaulted — not reliably detected by MediaPipe) ===
     props["ear_size_ratio"] = 0.0
@@ -234,37 +293,28 @@ def _compute_ipd(landmarks):
     return _dist2d(left_center, right_center)
 
 
-def _compute_jaw_angle(landmarks, ipd):
-    """Compute jaw angle metric.
+@njit(cache=True)
+def _jaw_deviation(coords, angle_left, jaw_left, angle_right, jaw_right, chin):
+    """Jaw angle metric (not yet divided by IPD).
 
-    Measures the angular sharpness of the jawline by comparing
-    the jaw angle position relative to the jaw corner and chin.
-    More angular jaws have sharper transitions.
-    """
-    # Left side: angle at jaw_angle_left between jaw_left and chin_bottom
-    jaw_angle_l = landmarks[LM["jaw_angle_left"]]
-    jaw_l = landmarks[LM["jaw_left"]]
-    chin = landmarks[LM["chin_bottom"]]
-
-    # Right side
-    jaw_angle_r = landmarks[LM["jaw_angle_right"]]
-    jaw_r = landmarks[LM["jaw_right"]]
-
-    # Compute how much the jaw angle point deviates inward from the jaw-chin line
-    # A sharper jawline = more deviation
-    left_dev = _point_line_distance_2d(jaw_angle_l, jaw_l, chin)
-    right_dev = _point_line_distance_2d(jaw_angle_r, jaw_r, chin)
-
-    avg_dev = (left_dev + right_dev) / 2
-    return avg_dev / ipd
+    Measures the angular sharpness of the jawline: how far each jaw angle
+    point deviates inward from its jaw-corner-to-chin line, averaged over
+    both sides. A sharper jawline = more deviation.
 
+    `coords` is a flat (x, y, z, x, y, z, ...) array; the other arguments
+    are the offsets of each landmark's x within it.
+    """
+    cx, cy = coords[chin], coords[chin + 1]
+    left_dev = _point_line_distance_2d(
+        coords[angle_left], coords[angle_left + 1], coords[jaw_left], coords[jaw_left + 1], cx, cy)
+    right_dev = _point_line_distance_2d(
+        coords[angle_right], coords[angle_right + 1], coords[jaw_right], coords[jaw_right + 1], cx, cy)
+    return (left_dev + right_dev) / 2
 
-def _point_line_distance_2d(point, line_start, line_end):
-    """Compute perpendicular distance from a point to a line in 2D (x, y)."""
-    x0, y0 = point[0], point[1]
-    x1, y1 = line_start[0], line_start[1]
-    x2, y2 = line_end[0], line_end[1]
 
+@njit(cache=True)
+def _point_line_distance_2d(x0, y0, x1, y1, x2, y2):
+    """Perpendicular distance from (x0, y0) to the line through (x1, y1) and (x2, y2)."""
     num = abs((y2 - y1) * x0 - (x2 - x1) * y0 + x2 * y1 - y2 * x1)
     den = math.sqrt((y2 - y1) ** 2 + (x2 - x1) ** 2)
 
@@ -273,20 +323,9 @@ def _point_line_distance_2d(point, line_start, line_end):
     return num / den
 
 
-def _compute_brow_arch(landmarks, ipd):
-    """Compute brow arch by measuring how much the mid-brow peaks above the inner-outer line."""
-    # Left brow arch
-    left_inner = landmarks[LM["left_brow_inner"]]
-    left_mid = landmarks[LM["left_brow_mid"]]
-    left_outer = landmarks[LM["left_brow_outer"]]
-    left_baseline_y = (left_inner[1] + left_outer[1]) / 2
-    left_arch = left_baseline_y - left_mid[1]  # positive = mid is higher (lower y)
-
-    # Right brow arch
-    right_inner = landmarks[LM["right_brow_inner"]]
-    right_mid = landmarks[LM["right_brow_mid"]]
-    right_outer = landmarks[LM["right_brow_outer"]]
-    right_baseline_y = (right_inner[1] + right_outer[1]) / 2
-    right_arch = right_baseline_y - right_mid[1]
-
-    return ((left_arch + right_arch) / 2) / ipd
+# Prefer the ahead-of-time build of the kernel when it has been compiled
+# (see _geom_aot.py); it skips JIT compilation on first use
+try:
+    from ._face_geom import jaw_deviation as _jaw_kernel
+except ImportError:
+    _jaw_kernel = _jaw_deviation
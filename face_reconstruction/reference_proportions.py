@@ -16,6 +16,8 @@ Based on anthropometric data (Farkas 1994) calibrated for MediaPipe output.
 These values should be empirically tuned for best results.
 """
 
+import numpy as np
+
 
 # === REFERENCE PROPORTIONS ===
 # Format: ratio_name -> (mean, std_deviation)
@@ -72,6 +74,12 @@ REFERENCE_PROPORTIONS = {
     "ear_angle_ratio":            (0.00, 0.10),    # placeholder
 }
 
+# The same table as parallel float32 arrays, for vectorized normalization:
+# (values - REFERENCE_MEANS) / (REFERENCE_STDS * sensitivity)
+REFERENCE_NAMES = tuple(REFERENCE_PROPORTIONS)
+REFERENCE_MEANS = np.array([mean for mean, _ in REFERENCE_PROPORTIONS.values()], dtype=np.float32)
+REFERENCE_STDS = np.array([std for _, std in REFERENCE_PROPORTIONS.values()], dtype=np.float32)
+
 
 # How many standard deviations = feature value ±1.0
 # Lower = more sensitive (small differences → large feature values)
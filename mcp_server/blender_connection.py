@@ -5,15 +5,38 @@ Sends JSON commands over TCP to the Blender addon's TCP server
 and receives JSON responses.
 """
 
+import asyncio
 import socket
 import json
 import os
 import time
 import logging
-import uuid
+import itertools
+import threading
+
+from semantic_layer.face_map import detect_rig_type
 
 logger = logging.getLogger("blender_metahuman_mcp.connection")
 
+HEARTBEAT_INTERVAL = 30.0  # Seconds between keep-alive pings on an idle connection
+
+# orjson is several times faster for large responses (list_bones, batches);
+# fall back to the stdlib when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
 
 class BlenderConnection:
     """TCP client that connects to the Blender MCP addon."""
@@ -22,9 +45,15 @@ class BlenderConnection:
         self.host = host or os.environ.get("BLENDER_HOST", "127.0.0.1")
         self.port = int(port or os.environ.get("BLENDER_PORT", "9876"))
         self._socket = None
+        self._recv_buffer = bytearray()
+        self._request_ids = itertools.count(1)  # next() is atomic under the GIL
         self._timeout = 15.0
         self._max_retries = 3
         self._retry_delay = 1.0
+        self._lock = threading.RLock()  # One request/response exchange at a time
+        self._last_used = 0.0
+        self._heartbeat = None
+        self._bones_cache = None  # (bone_names, rig_type), see invalidate_bones_cache()
 
     def connect(self):
         """Establish TCP connection to Blender."""
@@ -32,10 +61,22 @@ class BlenderConnection:
             self.disconnect()
 
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Small request/response messages: don't let Nagle hold them back
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._recv_buffer.clear()
+        # A new connection may be a restarted Blender with a different scene
+        self._bones_cache = None
         self._socket.settimeout(self._timeout)
         self._socket.connect((self.host, self.port))
+        self._last_used = time.monotonic()
         logger.info(f"Connected to Blender at {self.host}:{self.port}")
 
+        if self._heartbeat is None or not self._heartbeat.is_alive():
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+            self._heartbeat.start()
+
     def disconnect(self):
         """Close the TCP connection."""
         if self._socket:
@@ -45,6 +86,28 @@ class BlenderConnection:
                 pass
             self._socket = None
 
+    def invalidate_bones_cache(self):
+        """Forget the cached bone list; call after anything that may change the armature."""
+        self._bones_cache = None
+
+    def cache_rig(self, bone_names):
+        """Store a freshly listed bone set and return its rig type."""
+        self._bones_cache = (bone_names, detect_rig_type(bone_names))
+        return self._bones_cache[1]
+
+    def get_rig(self):
+        """Return (rig_type, error) for the armature in Blender.
+
+        Bone names only change with the scene, so list_bones is sent once and
+        the result kept until invalidate_bones_cache().
+        """
+        if self._bones_cache is None:
+            bones_result = self.send_command("list_bones", {"names_only": True})
+            if bones_result.get("status") != "success":
+                return None, bones_result.get("error", "Could not list bones")
+            self.cache_rig(bones_result["result"]["names"])
+        return self._bones_cache[1], None
+
     def is_connected(self):
         """Check if connection is alive."""
         if not self._socket:
@@ -73,67 +136,160 @@ class BlenderConnection:
             dict: Response from Blender with 'status' and 'result'/'error'.
         """
         request = {
-            "id": str(uuid.uuid4()),
+            "id": next(self._request_ids),
             "command": command,
             "params": params or {}
         }
+        return self._exchange([request])[0]
+
+    async def send_command_async(self, command, params=None):
+        """Awaitable send_command for async tools.
+
+        The exchange runs on a worker thread, so the event loop stays free
+        while Blender works; the connection lock still serializes requests.
+        """
+        return await asyncio.to_thread(self.send_command, command, params)
+
+    def send_batch(self, commands):
+        """Pipeline several commands over the connection.
+
+        Every request is written with a single sendall before any response
+        is read, so N independent commands cost one round trip instead of
+        N. Blender answers them in order.
+
+        Args:
+            commands: List of (command, params) tuples.
+
+        Returns:
+            list of response dicts, in the same order as `commands`.
+        """
+        requests = [
+            {"id": next(self._request_ids), "command": command, "params": params or {}}
+            for command, params in commands
+        ]
+        return self._exchange(requests) if requests else []
+
+    def _exchange(self, requests):
+        """Send requests back-to-back and read one response per request.
+
+        Reconnects and retries while nothing has been answered yet; once
+        some responses have arrived, the rest are reported as errors rather
+        than re-sent, so no command runs twice.
+        """
+        with self._lock:
+            responses = self._exchange_locked(requests)
+            self._last_used = time.monotonic()
+            return responses
+
+    def _exchange_locked(self, requests):
+        payload = b"".join(_dumps(request) + b"\n" for request in requests)
+        responses = []
+
+        def fail(error):
+            return responses + [{"status": "error", "error": error} for _ in requests[len(responses):]]
 
         for attempt in range(self._max_retries):
             try:
-                if not self.is_connected():
+                # No liveness probe here: a dead socket surfaces as a
+                # connection error from sendall/recv and is retried below
+                reused = self._socket is not None
+                if not reused:
                     self.connect()
 
                 # Send newline-delimited JSON
-                message = json.dumps(request) + "\n"
-                self._socket.sendall(message.encode("utf-8"))
+                self._socket.sendall(payload)
 
-                # Receive response
-                response_data = self._receive_response()
-                response = json.loads(response_data)
-                return response
+                # Receive responses
+                while len(responses) < len(requests):
+                    responses.append(_loads(self._receive_response()))
+                return responses
 
             except (ConnectionRefusedError, ConnectionResetError, BrokenPipeError) as e:
                 logger.warning(f"Connection error (attempt {attempt + 1}/{self._max_retries}): {e}")
                 self.disconnect()
+                if responses:
+                    return fail(f"Connection to Blender lost: {e}")
                 if attempt < self._max_retries - 1:
-                    time.sleep(self._retry_delay)
+                    if not reused:
+                        # A stale kept-alive socket is retried at once;
+                        # only fresh connection failures back off
+                        time.sleep(self._retry_delay)
                 else:
-                    return {
-                        "status": "error",
-                        "error": f"Cannot connect to Blender at {self.host}:{self.port}. "
-                                 f"Ensure Blender is running with the MCP addon enabled."
-                    }
+                    return fail(
+                        f"Cannot connect to Blender at {self.host}:{self.port}. "
+                        f"Ensure Blender is running with the MCP addon enabled."
+                    )
 
             except socket.timeout:
                 logger.error("Command timed out")
-                return {"status": "error", "error": "Command timed out waiting for Blender response"}
+                # A late response would be read as the answer to the next
+                # command, so drop the connection
+                self.disconnect()
+                return fail("Command timed out waiting for Blender response")
 
             except json.JSONDecodeError as e:
                 logger.error(f"Invalid JSON response: {e}")
-                return {"status": "error", "error": f"Invalid response from Blender: {e}"}
+                self.disconnect()
+                return fail(f"Invalid response from Blender: {e}")
 
             except Exception as e:
                 logger.error(f"Unexpected error: {e}")
                 self.disconnect()
-                return {"status": "error", "error": str(e)}
+                return fail(str(e))
+
+        return fail("Max retries exceeded")
 
-        return {"status": "error", "error": "Max retries exceeded"}
+    def _heartbeat_loop(self):
+        """Ping an idle connection so a dead peer is found before the next command.
+
+        A failed ping gets one reconnect attempt. The thread exits once
+        there is no connection to keep alive; connect() starts a new one.
+        """
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            if not self._lock.acquire(blocking=False):
+                continue  # A command is in flight, so the link is in use
+            try:
+                if self._socket is None:
+                    return
+                if time.monotonic() - self._last_used < HEARTBEAT_INTERVAL:
+                    continue
+                request = {"id": next(self._request_ids), "command": "ping", "params": {}}
+                try:
+                    self._socket.sendall(_dumps(request) + b"\n")
+                    self._receive_response()
+                    self._last_used = time.monotonic()
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Heartbeat failed ({e}), reconnecting")
+                    self.disconnect()
+                    try:
+                        self.connect()
+                    except OSError:
+                        self.disconnect()
+                        return
+            finally:
+                self._lock.release()
 
     def _receive_response(self):
-        """Receive a complete newline-delimited JSON response."""
-        buffer = ""
+        """Receive a complete newline-delimited JSON response (as a bytearray)."""
+        buffer = self._recv_buffer
+        scan_from = 0
         while True:
-            chunk = self._socket.recv(65536).decode("utf-8")
+            # Check for complete message (newline terminated); only the
+            # newly received bytes need scanning
+            newline = buffer.find(b"\n", scan_from)
+            if newline >= 0:
+                # Slicing copies once; the JSON loaders accept a bytearray
+                message = buffer[:newline]
+                del buffer[:newline + 1]
+                return message
+            scan_from = len(buffer)
+
+            chunk = self._socket.recv(65536)
             if not chunk:
                 raise ConnectionResetError("Connection closed by Blender")
-
             buffer += chunk
 
-            # Check for complete message (newline terminated)
-            if "\n" in buffer:
-                message, _ = buffer.split("\n", 1)
-                return message.strip()
-
     def ping(self):
         """Test the connection with a ping command.
 
@@ -6,7 +6,6 @@ and runs with STDIO transport for Claude Code integration.
 """
 
 import sys
-import os
 import logging
 
 # Setup logging
@@ -17,10 +16,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger("blender_metahuman_mcp")
 
-# Add project root to path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, PROJECT_ROOT)
-
 from mcp.server.fastmcp import FastMCP
 from mcp_server.blender_connection import get_connection
 
@@ -44,7 +39,7 @@ mcp = FastMCP(
     - Photo: reconstruct_face_from_photo, analyze_face_photo, compare_face_to_photo
     - High-level: edit_facial_feature, edit_face_natural, apply_face_preset
     - Mid-level: move_bone, scale_bone, rotate_bone
-    - Shape keys: set_shape_key, list_shape_keys
+    - Shape keys: set_shape_key, batch_set_shape_keys, list_shape_keys
     - Scene: import_metahuman, export_for_unreal, render_preview
     - Presets: apply_face_preset, list_face_presets, blend_face_presets
     """
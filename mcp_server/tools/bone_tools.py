@@ -5,20 +5,25 @@ Direct bone control for advanced users who know specific bone names.
 """
 
 import logging
+from typing import Literal
 
 logger = logging.getLogger("blender_metahuman_mcp.bone_tools")
 
+# Published as a JSON-schema enum, so the argument model FastMCP builds
+# at registration rejects any other axis before the tool body runs
+Axis = Literal["X", "Y", "Z"]
+
 
 def register_bone_tools(mcp, get_connection):
     """Register bone manipulation tools with the MCP server."""
 
     @mcp.tool()
-    def move_bone(bone_name: str, axis: str, amount: float) -> str:
+    def move_bone(bone_name: str, axis: Axis, amount: float) -> str:
         """Move a specific bone along an axis.
 
         Args:
             bone_name: Exact bone name in the armature.
-            axis: "X", "Y", or "Z".
+            axis: "X", "Y", or "Z" (uppercase only).
             amount: Distance to move (in Blender units/meters). Small values like 0.005.
 
         Returns:
@@ -27,7 +32,7 @@ def register_bone_tools(mcp, get_connection):
         conn = get_connection()
         result = conn.send_command("move_bone", {
             "bone_name": bone_name,
-            "axis": axis.upper(),
+            "axis": axis,
             "amount": amount,
         })
 
@@ -37,18 +42,18 @@ def register_bone_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def scale_bone(bone_name: str, axis: str, amount: float) -> str:
+    def scale_bone(bone_name: str, axis: Axis, amount: float) -> str:
         """Scale a bone on an axis.
 
         Args:
             bone_name: Exact bone name.
-            axis: "X", "Y", or "Z".
+            axis: "X", "Y", or "Z" (uppercase only).
             amount: Scale delta (e.g., 0.2 = 20% larger, -0.2 = 20% smaller).
         """
         conn = get_connection()
         result = conn.send_command("scale_bone", {
             "bone_name": bone_name,
-            "axis": axis.upper(),
+            "axis": axis,
             "amount": amount,
         })
 
@@ -58,18 +63,18 @@ def register_bone_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def rotate_bone(bone_name: str, axis: str, degrees: float) -> str:
+    def rotate_bone(bone_name: str, axis: Axis, degrees: float) -> str:
         """Rotate a bone on an axis.
 
         Args:
             bone_name: Exact bone name.
-            axis: "X", "Y", or "Z".
+            axis: "X", "Y", or "Z" (uppercase only).
             degrees: Rotation in degrees.
         """
         conn = get_connection()
         result = conn.send_command("rotate_bone", {
             "bone_name": bone_name,
-            "axis": axis.upper(),
+            "axis": axis,
             "degrees": degrees,
         })
 
@@ -104,26 +109,35 @@ def register_bone_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def list_all_bones(filter_pattern: str = "") -> str:
-        """List all bones in the armature.
+    def list_all_bones(filter_pattern: str = "", offset: int = 0) -> str:
+        """List bones in the armature, 100 per page.
 
         Args:
-            filter_pattern: Optional substring filter (e.g., "nose", "FACIAL", "jaw").
+            filter_pattern: Optional filter, case-insensitive. A plain string
+                            matches anywhere in the name (e.g., "nose", "jaw");
+                            a glob matches whole names (e.g., "FACIAL_*", "*_L_*").
+            offset: Index of the first matching bone to list, for paging.
 
         Returns:
             List of bone names with their parent relationships.
         """
         conn = get_connection()
-        result = conn.send_command("list_bones", {"filter": filter_pattern})
+        # Limit output; Blender only sends the requested page
+        result = conn.send_command(
+            "list_bones", {"filter": filter_pattern, "offset": offset, "limit": 100}
+        )
 
         if result.get("status") == "success":
             r = result["result"]
-            lines = [f"Armature: {r['armature']} ({r['count']} bones)"]
-            for bone in r["bones"][:100]:  # Limit output
-                parent = f" (parent: {bone['parent']})" if bone["parent"] else ""
-                lines.append(f"  {bone['name']}{parent}")
-            if r["count"] > 100:
-                lines.append(f"  ... and {r['count'] - 100} more. Use filter to narrow results.")
+            lines = [f"Armature: {r['armature']} ({r['total']} bones)"]
+            for name, parent in zip(r["names"], r["parents"]):
+                parent = f" (parent: {parent})" if parent else ""
+                lines.append(f"  {name}{parent}")
+            if r["next_offset"] is not None:
+                lines.append(
+                    f"  ... and {r['total'] - r['next_offset']} more. "
+                    f"Use offset={r['next_offset']} for the next page, or filter to narrow results."
+                )
             return "\n".join(lines)
         return f"Error: {result.get('error')}"
 
@@ -136,6 +150,7 @@ def register_bone_tools(mcp, get_connection):
         """
         conn = get_connection()
         result = conn.send_command("reset_bone", {"bone_name": bone_name})
+        conn.invalidate_bones_cache()
 
         if result.get("status") == "success":
             return f"Bone '{bone_name}' reset to rest position."
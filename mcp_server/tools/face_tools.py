@@ -6,23 +6,158 @@ via natural language. They use the semantic layer to translate
 feature names into bone operations.
 """
 
-import sys
-import os
 import logging
+from functools import lru_cache
 
-logger = logging.getLogger("blender_metahuman_mcp.face_tools")
-
-# Add project root to path for semantic_layer import
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import numpy as np
 
 from semantic_layer.face_map import (
-    FACIAL_FEATURE_MAP, get_operations_for_feature, get_all_features,
-    get_features_by_category, detect_rig_type
+    get_ops_table, get_all_features, get_features_by_category
 )
 from semantic_layer.validators import (
     validate_feature_name, clamp_value, normalize_direction, parse_natural_description
 )
 
+logger = logging.getLogger("blender_metahuman_mcp.face_tools")
+
+MIN_BONE_DELTA = 1e-5  # Operations moving a bone less than this are left out of batches
+
+
+# rig_type -> (feature_names, op_feature, op_refs, op_mult) for the
+# operations whose effect can be read back from the pose: location moves
+# with a non-negligible multiplier. op_refs holds (bone, axis_idx) per op.
+_READBACK_OPS = {}
+
+
+def readback_ops(rig_type):
+    """Flatten the rig's location operations into parallel arrays, once per rig."""
+    tables = _READBACK_OPS.get(rig_type)
+    if tables is None:
+        feature_names = []
+        op_feature, op_refs, op_mult = [], [], []
+        for feature_idx, (feature_name, operations) in enumerate(get_ops_table(rig_type).items()):
+            feature_names.append(feature_name)
+            for op in operations:
+                if op["transform"] == "location" and abs(op["multiplier"]) > 0.0001:
+                    op_feature.append(feature_idx)
+                    op_refs.append((op["bone"], op["axis_idx"]))
+                    op_mult.append(op["multiplier"])
+        tables = (
+            feature_names,
+            np.array(op_feature, dtype=np.intp),
+            op_refs,
+            np.array(op_mult, dtype=np.float64),
+        )
+        _READBACK_OPS[rig_type] = tables
+    return tables
+
+
+def merge_bone_operations(operations):
+    """Combine batch_move_bones operations that hit the same bone, transform and axis.
+
+    batch_move_bones applies amounts as deltas: location and rotation
+    amounts add up, while scale amounts multiply the current value by
+    (1 + amount). Merged scale amounts therefore compose as a product,
+    so the merged batch leaves the pose exactly where the original would.
+    Operations that merge to a near-zero amount are left out.
+
+    Returns:
+        list of operation dicts, one per (bone_name, transform, axis),
+        in first-seen order.
+    """
+    merged = {}
+    for op in operations:
+        key = (op["bone_name"], op["transform"], op["axis"])
+        amount = op["amount"]
+        previous = merged.get(key)
+        if previous is None:
+            merged[key] = amount
+        elif op["transform"] == "scale":
+            merged[key] = (1.0 + previous) * (1.0 + amount) - 1.0
+        else:
+            merged[key] = previous + amount
+    return [
+        {"bone_name": bone, "transform": transform, "axis": axis, "amount": amount}
+        for (bone, transform, axis), amount in merged.items()
+        if abs(amount) >= MIN_BONE_DELTA
+    ]
+
+
+@lru_cache(maxsize=1)
+def _feature_listing():
+    """Text for list_editable_features; the feature map is static, so build it once."""
+    categories = get_features_by_category()
+    all_features = get_all_features()
+
+    lines = ["Available Facial Features:\n"]
+    for category, feature_names in sorted(categories.items()):
+        lines.append(f"\n=== {category.upper()} ===")
+        for name in sorted(feature_names):
+            info = all_features[name]
+            lines.append(f"  {name}: {info['description']} (range: {info['range'][0]} to {info['range'][1]})")
+
+    lines.append(f"\nTotal: {len(all_features)} features across {len(categories)} categories")
+    lines.append("\nUse edit_facial_feature(feature, value) to modify any feature.")
+    lines.append("Use edit_face_natural('description') for natural language editing.")
+
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def _parse_description(description):
+    """parse_natural_description, cached for re-issued prompts.
+
+    The parse is pure, so repeated descriptions skip it. Cached results
+    are shared between calls, hence the tuple; treat the edits as read-only.
+    """
+    return tuple(parse_natural_description(description))
+
+
+def _build_ops_for_edit(feature, value, ops_table):
+    """Validate one feature edit and build its bone operations without sending them.
+
+    Args:
+        feature: Feature name as given by the user (aliases allowed).
+        value: Requested value; clamped to -1.0..1.0.
+        ops_table: Table from get_ops_table() for the current rig.
+
+    Returns:
+        dict with 'valid', and either 'error' or 'name', 'value',
+        'clamped', 'operations' (batch_move_bones operation dicts) and
+        'dropped' (near-zero operations left out).
+    """
+    validation = validate_feature_name(feature)
+    if not validation["valid"]:
+        return {"valid": False, "error": validation["error"]}
+
+    feature_name = validation["name"]
+    value, was_clamped = clamp_value(value)
+
+    operations = ops_table.get(feature_name)
+    if not operations:
+        return {"valid": False, "error": f"No operations defined for feature '{feature_name}'"}
+
+    batch_ops = []
+    for op in operations:
+        amount = value * op["multiplier"]
+        if abs(amount) < MIN_BONE_DELTA:
+            continue
+        batch_ops.append({
+            "bone_name": op["bone"],
+            "transform": op["transform"],
+            "axis": op["axis"],
+            "amount": amount,
+        })
+
+    return {
+        "valid": True,
+        "name": feature_name,
+        "value": value,
+        "clamped": was_clamped,
+        "operations": batch_ops,
+        "dropped": len(operations) - len(batch_ops),
+    }
+
 
 def register_face_tools(mcp, get_connection):
     """Register high-level face editing tools with the MCP server."""
@@ -44,46 +179,27 @@ def register_face_tools(mcp, get_connection):
         """
         conn = get_connection()
 
-        # Validate feature name
-        validation = validate_feature_name(feature)
-        if not validation["valid"]:
-            return f"Error: {validation['error']}"
+        # Detect rig type (cached per connection)
+        rig_type, error = conn.get_rig()
+        if error:
+            return f"Error: {error}"
 
-        feature_name = validation["name"]
-        value, was_clamped = clamp_value(value)
-
-        # Detect rig type by listing bones first
-        bones_result = conn.send_command("list_bones", {})
-        if bones_result.get("status") != "success":
-            return f"Error: {bones_result.get('error', 'Could not list bones')}"
+        edit = _build_ops_for_edit(feature, value, get_ops_table(rig_type))
+        if not edit["valid"]:
+            return f"Error: {edit['error']}"
+        if not edit["operations"]:
+            return f"'{edit['name']}' = {edit['value']} moves no bones, nothing to apply"
 
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
-
-        # Get resolved operations
-        operations = get_operations_for_feature(feature_name, rig_type)
-        if not operations:
-            return f"Error: No operations defined for feature '{feature_name}'"
-
-        # Build batch bone operation
-        batch_ops = []
-        for op in operations:
-            amount = value * op["multiplier"]
-            batch_ops.append({
-                "bone_name": op["bone"],
-                "transform": op["transform"],
-                "axis": op["axis"],
-                "amount": amount,
-            })
-
-        result = conn.send_command("batch_move_bones", {"operations": batch_ops})
+        result = conn.send_command("batch_move_bones", {"operations": edit["operations"]})
 
         if result.get("status") == "success":
             applied = result["result"]["applied"]
             skipped = result["result"]["skipped"]
-            msg = f"Applied '{feature_name}' = {value} ({applied} bone operations"
-            if was_clamped:
+            msg = f"Applied '{edit['name']}' = {edit['value']} ({applied} bone operations"
+            if edit["clamped"]:
                 msg += ", value was clamped to range"
+            if edit["dropped"]:
+                msg += f", {edit['dropped']} near-zero operations skipped"
             if skipped:
                 msg += f", {len(skipped)} bones not found: {skipped}"
             msg += f", rig type: {rig_type})"
@@ -106,7 +222,7 @@ def register_face_tools(mcp, get_connection):
         Returns:
             Summary of all applied changes.
         """
-        edits = parse_natural_description(description)
+        edits = _parse_description(description)
 
         if not edits:
             return (
@@ -115,10 +231,38 @@ def register_face_tools(mcp, get_connection):
                 "Use list_editable_features to see available features."
             )
 
+        conn = get_connection()
+        rig_type, error = conn.get_rig()
+        if error:
+            return f"Error: {error}"
+        ops_table = get_ops_table(rig_type)
+
+        # Every edit goes out in one batch_move_bones call
+        all_ops = []
         results = []
         for edit in edits:
-            result = edit_facial_feature(edit["feature"], edit["value"])
-            results.append(f"  {edit['feature']}: {edit['value']:+.2f} ({edit.get('direction', '')}) -> {result}")
+            built = _build_ops_for_edit(edit["feature"], edit["value"], ops_table)
+            prefix = f"  {edit['feature']}: {edit['value']:+.2f} ({edit.get('direction', '')}) -> "
+            if not built["valid"]:
+                results.append(prefix + f"Error: {built['error']}")
+                continue
+            all_ops.extend(built["operations"])
+            note = ", value was clamped to range" if built["clamped"] else ""
+            if built["dropped"]:
+                note += f", {built['dropped']} near-zero operations skipped"
+            results.append(prefix + f"{len(built['operations'])} bone operations{note}")
+
+        # Edits touching the same bone axis go out as one combined delta
+        all_ops = merge_bone_operations(all_ops)
+        if all_ops:
+            result = conn.send_command("batch_move_bones", {"operations": all_ops})
+            if result.get("status") != "success":
+                return f"Error: {result.get('error', 'Unknown error')}"
+            footer = f"{result['result']['applied']} bone operations applied (rig type: {rig_type})"
+            skipped = result["result"]["skipped"]
+            if skipped:
+                footer += f", {len(skipped)} bones not found: {skipped}"
+            results.append(footer)
 
         return f"Applied {len(edits)} changes from: \"{description}\"\n" + "\n".join(results)
 
@@ -128,21 +272,7 @@ def register_face_tools(mcp, get_connection):
 
         Returns a categorized list of features with descriptions and valid ranges.
         """
-        categories = get_features_by_category()
-        all_features = get_all_features()
-
-        lines = ["Available Facial Features:\n"]
-        for category, feature_names in sorted(categories.items()):
-            lines.append(f"\n=== {category.upper()} ===")
-            for name in sorted(feature_names):
-                info = all_features[name]
-                lines.append(f"  {name}: {info['description']} (range: {info['range'][0]} to {info['range'][1]})")
-
-        lines.append(f"\nTotal: {len(all_features)} features across {len(categories)} categories")
-        lines.append("\nUse edit_facial_feature(feature, value) to modify any feature.")
-        lines.append("Use edit_face_natural('description') for natural language editing.")
-
-        return "\n".join(lines)
+        return _feature_listing()
 
     @mcp.tool()
     def describe_current_face() -> str:
@@ -157,29 +287,21 @@ def register_face_tools(mcp, get_connection):
         if bones_result.get("status") != "success":
             return f"Error: {bones_result.get('error')}"
 
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
+        bone_names = bones_result["result"]["names"]
+        rig_type = conn.cache_rig(bone_names)
+        # list_bones already carries every pose location, so no per-bone reads
+        locations = dict(zip(bone_names, bones_result["result"]["locations"]))
 
         # Check each feature's bones for modifications
-        modified = []
-        for feature_name, feature_data in FACIAL_FEATURE_MAP.items():
-            operations = get_operations_for_feature(feature_name, rig_type)
-            total_deviation = 0.0
-
-            for op in operations:
-                bone_result = conn.send_command("get_bone_transform", {"bone_name": op["bone"]})
-                if bone_result.get("status") == "success":
-                    loc = bone_result["result"]["location"]
-                    axis_idx = {"X": 0, "Y": 1, "Z": 2}.get(op["axis"], 0)
-
-                    if op["transform"] == "location" and abs(loc[axis_idx]) > 0.0005:
-                        # Reverse-calculate the approximate feature value
-                        if abs(op["multiplier"]) > 0.0001:
-                            approx_value = loc[axis_idx] / op["multiplier"]
-                            total_deviation += abs(approx_value)
+        feature_names, op_feature, op_refs, op_mult = readback_ops(rig_type)
+        deviation = [0.0] * len(feature_names)
+        for feature_idx, (bone, axis_idx), multiplier in zip(op_feature.tolist(), op_refs, op_mult.tolist()):
+            loc = locations.get(bone)
+            if loc is not None and abs(loc[axis_idx]) > 0.0005:
+                # Reverse-calculate the approximate feature value
+                deviation[feature_idx] += abs(loc[axis_idx] / multiplier)
 
-            if total_deviation > 0.05:
-                modified.append(feature_name)
+        modified = [name for name, total in zip(feature_names, deviation) if total > 0.05]
 
         if not modified:
             return "Face is at default position — no features have been modified."
@@ -194,6 +316,7 @@ def register_face_tools(mcp, get_connection):
         """
         conn = get_connection()
         result = conn.send_command("reset_all_bones", {})
+        conn.invalidate_bones_cache()
 
         if result.get("status") == "success":
             return f"Face reset to default. {result['result']['bones_reset']} bones restored."
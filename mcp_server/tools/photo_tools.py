@@ -8,35 +8,87 @@ facial measurements, and the semantic layer for bone operations.
 Pipeline: Photo -> Landmarks -> Proportions -> Features -> Bone Ops -> Blender
 """
 
-import sys
-import os
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
 
-logger = logging.getLogger("blender_metahuman_mcp.photo_tools")
-
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import numpy as np
 
 from face_reconstruction import (
     detect_face_landmarks,
     analyze_proportions,
     map_proportions_to_features,
+    map_proportions_to_feature_array,
     get_feature_confidence,
+    warm_up_landmarker,
 )
 from face_reconstruction.feature_mapper import (
+    FEATURE_NAMES,
     get_top_distinctive_features,
     format_features_by_category,
 )
-from semantic_layer.face_map import (
-    get_operations_for_feature, detect_rig_type, FACIAL_FEATURE_MAP
+from semantic_layer.face_map import get_ops_table
+from mcp_server.tools.face_tools import (
+    MIN_BONE_DELTA, merge_bone_operations, readback_ops
 )
 
+logger = logging.getLogger("blender_metahuman_mcp.photo_tools")
+
+# Landmark detection is CPU-bound; it runs here so the MCP event loop
+# keeps serving other tool calls. Landmarkers are pooled by the detector.
+_DETECT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="landmarks")
+
+
+# rig_type -> (op_feature, op_keys, op_mult, has_ops): every operation of
+# the rig flattened in FEATURE_NAMES order, with op_keys holding
+# (bone, transform, axis) and has_ops flagging features that move bones
+_APPLY_OPS = {}
+
+# One comparison row: name, current, photo, delta
+_COMPARE_ROW = "  {:<22} {:>+8.3f} {:>+8.3f} {:>+8.3f}".format
+
+
+def _apply_ops(rig_type):
+    """Flatten the rig's operations for the photo feature vector, once per rig."""
+    tables = _APPLY_OPS.get(rig_type)
+    if tables is None:
+        ops_table = get_ops_table(rig_type)
+        op_feature, op_keys, op_mult = [], [], []
+        has_ops = np.zeros(len(FEATURE_NAMES), dtype=bool)
+        for feature_idx, feature_name in enumerate(FEATURE_NAMES):
+            operations = ops_table.get(feature_name)
+            if not operations:
+                continue
+            has_ops[feature_idx] = True
+            for op in operations:
+                op_feature.append(feature_idx)
+                op_keys.append((op["bone"], op["transform"], op["axis"]))
+                op_mult.append(op["multiplier"])
+        tables = (
+            np.array(op_feature, dtype=np.intp),
+            op_keys,
+            np.array(op_mult, dtype=np.float64),
+            has_ops,
+        )
+        _APPLY_OPS[rig_type] = tables
+    return tables
+
+
+async def _detect(photo_path):
+    """Run detect_face_landmarks on the detection pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DETECT_EXECUTOR, detect_face_landmarks, photo_path)
+
 
 def register_photo_tools(mcp, get_connection):
     """Register photo-to-3D reconstruction tools with the MCP server."""
 
+    # Load the model in the background so the first photo doesn't pay for it
+    _DETECT_EXECUTOR.submit(warm_up_landmarker)
+
     @mcp.tool()
-    def reconstruct_face_from_photo(
+    async def reconstruct_face_from_photo(
         photo_path: str,
         sensitivity: float = 1.5,
         reset_first: bool = True,
@@ -62,8 +114,11 @@ def register_photo_tools(mcp, get_connection):
         """
         conn = get_connection()
 
-        # Step 1: Validate and detect landmarks
-        result = detect_face_landmarks(photo_path)
+        # Step 1: Detect landmarks while the rig type is looked up in Blender
+        result, (rig_type, rig_error) = await asyncio.gather(
+            _detect(photo_path),
+            asyncio.to_thread(conn.get_rig),
+        )
         if not result["success"]:
             return f"Error: {result['error']}"
 
@@ -76,53 +131,42 @@ def register_photo_tools(mcp, get_connection):
             return "Error: Could not compute facial proportions from landmarks."
 
         # Step 3: Map to features
-        features = map_proportions_to_features(proportions, sensitivity)
+        values = map_proportions_to_feature_array(proportions, sensitivity).astype(np.float64)
+        features = dict(zip(FEATURE_NAMES, values.tolist()))
         feature_confidence = get_feature_confidence(proportions)
 
-        # Step 4: Reset bones if requested
+        # Step 4: Check the rig type looked up in step 1
+        if rig_error:
+            return f"Error: {rig_error}"
+
+        # Step 5: Reset bones if requested (only once the photo is known good)
         if reset_first:
-            reset_result = conn.send_command("reset_all_bones", {})
+            reset_result = await conn.send_command_async("reset_all_bones", {})
             if reset_result.get("status") != "success":
                 return f"Error resetting face: {reset_result.get('error')}"
 
-        # Step 5: Detect rig type
-        bones_result = conn.send_command("list_bones", {})
-        if bones_result.get("status") != "success":
-            return f"Error: {bones_result.get('error', 'Could not list bones')}"
-
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
-
-        # Step 6: Build ALL bone operations for ALL features at once
-        all_ops = []
-        applied_features = 0
-        skipped_features = []
-
-        for feature_name, value in features.items():
-            if abs(value) < 0.01:  # Skip near-zero features (no visible change)
-                continue
-
-            operations = get_operations_for_feature(feature_name, rig_type)
-            if not operations:
-                skipped_features.append(feature_name)
-                continue
+        # Step 6: Build ALL bone operations for ALL features at once.
+        # Near-zero features (no visible change) are skipped.
+        op_feature, op_keys, op_mult, has_ops = _apply_ops(rig_type)
+        active = np.abs(values) >= 0.01
+        applied_features = int(np.count_nonzero(active & has_ops))
 
-            for op in operations:
-                amount = value * op["multiplier"]
-                all_ops.append({
-                    "bone_name": op["bone"],
-                    "transform": op["transform"],
-                    "axis": op["axis"],
-                    "amount": amount,
-                })
+        amounts = values[op_feature] * op_mult
+        op_active = active[op_feature]
+        keep = op_active & (np.abs(amounts) >= MIN_BONE_DELTA)
+        dropped_ops = int(np.count_nonzero(op_active)) - int(np.count_nonzero(keep))
 
-            applied_features += 1
+        all_ops = [
+            {"bone_name": bone, "transform": transform, "axis": axis, "amount": amount}
+            for (bone, transform, axis), amount in zip(compress(op_keys, keep), amounts[keep].tolist())
+        ]
 
-        # Step 7: Send batch operation to Blender
+        # Step 7: Send batch operation to Blender, one delta per bone axis
+        all_ops = merge_bone_operations(all_ops)
         if not all_ops:
             return "Photo analyzed but no significant facial differences detected from the average face."
 
-        batch_result = conn.send_command("batch_move_bones", {"operations": all_ops})
+        batch_result = await conn.send_command_async("batch_move_bones", {"operations": all_ops})
 
         if batch_result.get("status") != "success":
             return f"Error applying face: {batch_result.get('error')}"
@@ -142,6 +186,8 @@ def register_photo_tools(mcp, get_connection):
             f"Bone operations: {applied_ops}",
         ]
 
+        if dropped_ops:
+            lines.append(f"Near-zero operations skipped: {dropped_ops}")
         if skipped_bones:
             lines.append(f"Bones not found: {len(skipped_bones)} (normal for test rigs)")
 
@@ -157,7 +203,7 @@ def register_photo_tools(mcp, get_connection):
         return "\n".join(lines)
 
     @mcp.tool()
-    def analyze_face_photo(photo_path: str) -> str:
+    async def analyze_face_photo(photo_path: str) -> str:
         """Analyze a face photo and return detected features WITHOUT applying them.
 
         Useful for previewing what the reconstruction would look like,
@@ -170,7 +216,7 @@ def register_photo_tools(mcp, get_connection):
             Detailed analysis of detected facial proportions and features.
         """
         # Step 1: Detect landmarks
-        result = detect_face_landmarks(photo_path)
+        result = await _detect(photo_path)
         if not result["success"]:
             return f"Error: {result['error']}"
 
@@ -211,7 +257,7 @@ def register_photo_tools(mcp, get_connection):
         return "\n".join(lines)
 
     @mcp.tool()
-    def compare_face_to_photo(photo_path: str) -> str:
+    async def compare_face_to_photo(photo_path: str) -> str:
         """Compare the current Blender face to a reference photo.
 
         Shows which features differ between the current 3D face
@@ -225,8 +271,11 @@ def register_photo_tools(mcp, get_connection):
         """
         conn = get_connection()
 
-        # Analyze the photo
-        result = detect_face_landmarks(photo_path)
+        # Analyze the photo while Blender reports the current bone state
+        result, bones_result = await asyncio.gather(
+            _detect(photo_path),
+            conn.send_command_async("list_bones", {}),
+        )
         if not result["success"]:
             return f"Error: {result['error']}"
 
@@ -236,33 +285,32 @@ def register_photo_tools(mcp, get_connection):
 
         photo_features = map_proportions_to_features(proportions)
 
-        # Read current Blender bone state to estimate current features
-        bones_result = conn.send_command("list_bones", {})
+        # Current Blender bone state, to estimate current features
         if bones_result.get("status") != "success":
             return f"Error: {bones_result.get('error')}"
 
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
-
-        # Estimate current feature values from bone positions
-        current_features = {}
-        for feature_name, feature_data in FACIAL_FEATURE_MAP.items():
-            operations = get_operations_for_feature(feature_name, rig_type)
-            total_value = 0.0
-            count = 0
-
-            for op in operations:
-                bone_result = conn.send_command("get_bone_transform", {"bone_name": op["bone"]})
-                if bone_result.get("status") == "success":
-                    loc = bone_result["result"]["location"]
-                    axis_idx = {"X": 0, "Y": 1, "Z": 2}.get(op["axis"], 0)
-
-                    if op["transform"] == "location" and abs(op["multiplier"]) > 0.0001:
-                        approx_value = loc[axis_idx] / op["multiplier"]
-                        total_value += approx_value
-                        count += 1
-
-            current_features[feature_name] = total_value / max(count, 1) if count > 0 else 0.0
+        bone_names = bones_result["result"]["names"]
+        rig_type = conn.cache_rig(bone_names)
+        # list_bones already carries every pose location, so no per-bone reads
+        locations = dict(zip(bone_names, bones_result["result"]["locations"]))
+
+        # Estimate current feature values from bone positions: each readable
+        # op gives loc[axis] / multiplier, averaged per feature over the ops
+        # whose bone exists in this armature
+        feature_names, op_feature, op_refs, op_mult = readback_ops(rig_type)
+        found = []
+        values = []
+        for i, (bone, axis_idx) in enumerate(op_refs):
+            loc = locations.get(bone)
+            if loc is not None:
+                found.append(i)
+                values.append(loc[axis_idx])
+        approx = np.array(values, dtype=np.float64) / op_mult[found]
+        n_features = len(feature_names)
+        totals = np.bincount(op_feature[found], weights=approx, minlength=n_features)
+        counts = np.bincount(op_feature[found], minlength=n_features)
+        current_arr = np.divide(totals, counts, out=np.zeros(n_features), where=counts > 0)
+        current_features = dict(zip(feature_names, current_arr.tolist()))
 
         # Compare
         lines = [
@@ -273,18 +321,16 @@ def register_photo_tools(mcp, get_connection):
             f"{'-' * 55}",
         ]
 
+        names = sorted(photo_features.keys())
+        photo_arr = np.array([photo_features[name] for name in names], dtype=np.float64)
+        current_arr = np.array([current_features.get(name, 0.0) for name in names], dtype=np.float64)
+        delta_arr = photo_arr - current_arr
+
         significant_diffs = []
-        for name in sorted(photo_features.keys()):
-            current = current_features.get(name, 0.0)
-            photo = photo_features[name]
-            delta = photo - current
-
-            if abs(delta) >= 0.05:
-                significant_diffs.append((name, current, photo, delta))
-                c_str = f"{current:+.3f}"
-                p_str = f"{photo:+.3f}"
-                d_str = f"{delta:+.3f}"
-                lines.append(f"  {name:<22} {c_str:>8} {p_str:>8} {d_str:>8}")
+        for i in np.flatnonzero(np.abs(delta_arr) >= 0.05).tolist():
+            name, current, photo, delta = names[i], current_arr[i], photo_arr[i], delta_arr[i]
+            significant_diffs.append((name, current, photo, delta))
+            lines.append(_COMPARE_ROW(name, current, photo, delta))
 
         if not significant_diffs:
             lines.append("  No significant differences found!")
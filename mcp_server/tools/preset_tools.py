@@ -2,15 +2,30 @@
 Face preset tools — apply predefined facial feature combinations.
 """
 
-import sys
-import os
 import logging
+from functools import lru_cache
+
+from semantic_layer.face_map import get_ops_table
+from semantic_layer.presets import FACE_PRESETS, list_presets, get_preset, blend_presets, compile_preset
+from semantic_layer.validators import clamp_value
+from mcp_server.tools.face_tools import merge_bone_operations
 
 logger = logging.getLogger("blender_metahuman_mcp.preset_tools")
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from semantic_layer.presets import FACE_PRESETS, list_presets, get_preset, blend_presets
+@lru_cache(maxsize=1)
+def _preset_listing():
+    """Text for list_face_presets; the presets are static, so build it once."""
+    presets = list_presets()
+
+    lines = ["Available Face Presets:\n"]
+    for name, description in sorted(presets.items()):
+        lines.append(f"  {name}: {description}")
+
+    lines.append(f"\nTotal: {len(presets)} presets")
+    lines.append("Use apply_face_preset(name) to apply, or apply_face_preset(name, 0.5) for half intensity.")
+
+    return "\n".join(lines)
 
 
 def register_preset_tools(mcp, get_connection):
@@ -32,40 +47,27 @@ def register_preset_tools(mcp, get_connection):
             available = ", ".join(list_presets().keys())
             return f"Preset '{preset_name}' not found. Available: {available}"
 
-        # Import face_tools edit function via connection
-        from semantic_layer.face_map import get_operations_for_feature, detect_rig_type
-        from semantic_layer.validators import clamp_value
-
         conn = get_connection()
 
-        # Detect rig
-        bones_result = conn.send_command("list_bones", {})
-        if bones_result.get("status") != "success":
-            return f"Error: {bones_result.get('error')}"
+        # Detect rig (cached per connection)
+        rig_type, error = conn.get_rig()
+        if error:
+            return f"Error: {error}"
 
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
-
-        # Apply each feature in the preset
+        # Apply each feature in the preset (operations resolved once per rig)
         results = []
         all_ops = []
 
-        for feature_name, value in preset["features"].items():
-            adjusted_value = value * intensity
-            adjusted_value, _ = clamp_value(adjusted_value)
-
-            operations = get_operations_for_feature(feature_name, rig_type)
-            for op in operations:
-                amount = adjusted_value * op["multiplier"]
-                all_ops.append({
-                    "bone_name": op["bone"],
-                    "transform": op["transform"],
-                    "axis": op["axis"],
-                    "amount": amount,
-                })
+        for feature_name, value, operations in compile_preset(preset_name, rig_type):
+            adjusted_value, _ = clamp_value(value * intensity)
+            all_ops.extend(
+                {"bone_name": bone, "transform": transform, "axis": axis, "amount": adjusted_value * multiplier}
+                for bone, transform, axis, multiplier in operations
+            )
             results.append(f"  {feature_name}: {adjusted_value:+.2f}")
 
-        # Batch apply all operations
+        # Batch apply all operations, one delta per bone axis
+        all_ops = merge_bone_operations(all_ops)
         batch_result = conn.send_command("batch_move_bones", {"operations": all_ops})
 
         if batch_result.get("status") == "success":
@@ -85,16 +87,7 @@ def register_preset_tools(mcp, get_connection):
 
         Returns preset names grouped by type (face shape, nose, eyes, etc.)
         """
-        presets = list_presets()
-
-        lines = ["Available Face Presets:\n"]
-        for name, description in sorted(presets.items()):
-            lines.append(f"  {name}: {description}")
-
-        lines.append(f"\nTotal: {len(presets)} presets")
-        lines.append("Use apply_face_preset(name) to apply, or apply_face_preset(name, 0.5) for half intensity.")
-
-        return "\n".join(lines)
+        return _preset_listing()
 
     @mcp.tool()
     def blend_face_presets(preset_a: str, preset_b: str, blend_factor: float = 0.5) -> str:
@@ -112,22 +105,17 @@ def register_preset_tools(mcp, get_connection):
             return f"Error: One or both presets not found ('{preset_a}', '{preset_b}')"
 
         # Apply the blended features
-        from semantic_layer.face_map import get_operations_for_feature, detect_rig_type
-        from semantic_layer.validators import clamp_value
-
         conn = get_connection()
 
-        bones_result = conn.send_command("list_bones", {})
-        if bones_result.get("status") != "success":
-            return f"Error: {bones_result.get('error')}"
-
-        bone_names = [b["name"] for b in bones_result["result"]["bones"]]
-        rig_type = detect_rig_type(bone_names)
+        rig_type, error = conn.get_rig()
+        if error:
+            return f"Error: {error}"
 
+        ops_table = get_ops_table(rig_type)
         all_ops = []
         for feature_name, value in blended.items():
             value, _ = clamp_value(value)
-            operations = get_operations_for_feature(feature_name, rig_type)
+            operations = ops_table.get(feature_name, ())
             for op in operations:
                 all_ops.append({
                     "bone_name": op["bone"],
@@ -136,6 +124,7 @@ def register_preset_tools(mcp, get_connection):
                     "amount": value * op["multiplier"],
                 })
 
+        all_ops = merge_bone_operations(all_ops)
         result = conn.send_command("batch_move_bones", {"operations": all_ops})
 
         if result.get("status") == "success":
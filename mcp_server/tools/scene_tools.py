@@ -2,16 +2,21 @@
 Scene management tools — import, export, render preview, undo/redo.
 """
 
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger("blender_metahuman_mcp.scene_tools")
 
+EXPORT_POLL_INTERVAL = 0.25  # Seconds between poll_export_status calls
+EXPORT_TIMEOUT = 600.0       # Give up waiting on an export after this long
+
 
 def register_scene_tools(mcp, get_connection):
     """Register scene management tools with the MCP server."""
 
     @mcp.tool()
-    def import_metahuman(file_path: str) -> str:
+    async def import_metahuman(file_path: str) -> str:
         """Import a MetaHuman FBX file into Blender.
 
         After import, the armature will be auto-detected and ready for
@@ -21,7 +26,9 @@ def register_scene_tools(mcp, get_connection):
             file_path: Full path to the .fbx file.
         """
         conn = get_connection()
-        result = conn.send_command("import_fbx", {"filepath": file_path})
+        result = await conn.send_command_async("import_fbx", {"filepath": file_path})
+        # The import may replace the armature
+        conn.invalidate_bones_cache()
 
         if result.get("status") == "success":
             r = result["result"]
@@ -36,7 +43,7 @@ def register_scene_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def export_for_unreal(file_path: str = "", selected_only: bool = True) -> str:
+    async def export_for_unreal(file_path: str = "", selected_only: bool = True) -> str:
         """Export the modified MetaHuman as FBX for Unreal Engine.
 
         Uses Unreal-compatible FBX settings (Z-up, scale 1.0, no leaf bones).
@@ -46,11 +53,32 @@ def register_scene_tools(mcp, get_connection):
             selected_only: If True, export only selected objects.
         """
         conn = get_connection()
-        result = conn.send_command("export_fbx", {
+        result = await conn.send_command_async("export_fbx", {
             "filepath": file_path,
             "selected_only": selected_only,
+            "async": True,
         })
 
+        # Exports run on a later Blender tick; poll so a long export can't
+        # trip the per-command response timeout. The waits yield to the
+        # event loop, so other tools keep running meanwhile
+        if result.get("status") == "pending":
+            export_id = result["result"]["export_id"]
+            deadline = time.monotonic() + EXPORT_TIMEOUT
+            while True:
+                await asyncio.sleep(EXPORT_POLL_INTERVAL)
+                poll = await conn.send_command_async("poll_export_status", {"export_id": export_id})
+                if poll.get("status") != "success":
+                    result = poll
+                    break
+                job = poll["result"]
+                if job["status"] in ("success", "error"):
+                    result = job
+                    break
+                if time.monotonic() > deadline:
+                    result = {"status": "error", "error": f"Export did not finish within {EXPORT_TIMEOUT:.0f}s"}
+                    break
+
         if result.get("status") == "success":
             r = result["result"]
             size_kb = r.get("file_size_bytes", 0) / 1024
@@ -66,14 +94,16 @@ def register_scene_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def render_preview(angle: str = "front") -> str:
+    async def render_preview(angle: str = "front", engine: str = "render") -> str:
         """Render a preview image of the current face.
 
         Args:
             angle: Camera angle — "front", "side", "three_quarter", or "current".
+            engine: "render" for a full Cycles/Eevee render, or "offscreen" for a
+                    fast viewport snapshot (falls back to "render" without a UI).
         """
         conn = get_connection()
-        result = conn.send_command("render_preview", {"angle": angle})
+        result = await conn.send_command_async("render_preview", {"angle": angle, "engine": engine})
 
         if result.get("status") == "success":
             r = result["result"]
@@ -89,6 +119,8 @@ def register_scene_tools(mcp, get_connection):
         """Undo the last operation in Blender."""
         conn = get_connection()
         result = conn.send_command("undo", {})
+        # Undo/redo can add or remove an imported armature
+        conn.invalidate_bones_cache()
         if result.get("status") == "success":
             return "Undo successful"
         return f"Error: {result.get('error')}"
@@ -98,6 +130,7 @@ def register_scene_tools(mcp, get_connection):
         """Redo the last undone operation in Blender."""
         conn = get_connection()
         result = conn.send_command("redo", {})
+        conn.invalidate_bones_cache()
         if result.get("status") == "success":
             return "Redo successful"
         return f"Error: {result.get('error')}"
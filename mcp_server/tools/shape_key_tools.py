@@ -28,6 +28,30 @@ def register_shape_key_tools(mcp, get_connection):
             return f"Shape key '{r['shape_key']}' set to {r['value']} on mesh '{r['mesh']}'"
         return f"Error: {result.get('error')}"
 
+    @mcp.tool()
+    def batch_set_shape_keys(values: dict[str, float]) -> str:
+        """Set several shape keys on the face mesh in one call.
+
+        Use this instead of repeated set_shape_key calls when posing an
+        expression; every value is applied in a single Blender update.
+
+        Args:
+            values: Mapping of shape key name to value from 0.0 to 1.0
+                    (e.g., {"mouthSmileLeft": 0.8, "mouthSmileRight": 0.8}).
+        """
+        conn = get_connection()
+        result = conn.send_command("batch_set_shape_keys", {"values": values})
+
+        if result.get("status") == "success":
+            r = result["result"]
+            lines = [f"Set {len(r['applied'])} shape keys on mesh '{r['mesh']}'"]
+            for sk in r["applied"]:
+                lines.append(f"  {sk['name']} = {sk['value']:.3f}")
+            if r["skipped"]:
+                lines.append(f"Not found: {', '.join(r['skipped'])}")
+            return "\n".join(lines)
+        return f"Error: {result.get('error')}"
+
     @mcp.tool()
     def get_shape_key(name: str) -> str:
         """Get the current value of a shape key.
@@ -49,22 +73,31 @@ def register_shape_key_tools(mcp, get_connection):
         return f"Error: {result.get('error')}"
 
     @mcp.tool()
-    def list_shape_keys(filter_text: str = "") -> str:
-        """List all shape keys on the face mesh.
+    def list_shape_keys(filter_text: str = "", offset: int = 0) -> str:
+        """List shape keys on the face mesh, 500 per page.
 
         Args:
             filter_text: Optional substring to filter shape key names.
+            offset: Index of the first matching shape key to list, for paging.
         """
         conn = get_connection()
-        result = conn.send_command("list_shape_keys", {"filter": filter_text})
+        # Blender filters and only sends the requested page
+        result = conn.send_command(
+            "list_shape_keys", {"filter": filter_text, "offset": offset, "limit": 500}
+        )
 
         if result.get("status") == "success":
             r = result["result"]
-            lines = [f"Mesh: {r['mesh']} ({r['count']} shape keys)"]
+            lines = [f"Mesh: {r['mesh']} ({r['total']} shape keys)"]
             for sk in r["shape_keys"]:
                 val_str = f" = {sk['value']:.3f}" if sk["value"] != 0.0 else ""
                 muted = " [MUTED]" if sk["mute"] else ""
                 lines.append(f"  {sk['name']}{val_str}{muted}")
+            if r["next_offset"] is not None:
+                lines.append(
+                    f"  ... and {r['total'] - r['next_offset']} more. "
+                    f"Use offset={r['next_offset']} for the next page, or filter to narrow results."
+                )
             return "\n".join(lines)
         return f"Error: {result.get('error')}"
 
@@ -1,4 +1,4 @@
 # Semantic facial feature mapping layer
-from .face_map import FACIAL_FEATURE_MAP, BONE_ALIAS_MAPS, detect_rig_type, get_operations_for_feature
-from .presets import FACE_PRESETS
+from .face_map import FACIAL_FEATURE_MAP, BONE_ALIAS_MAPS, detect_rig_type, get_operations_for_feature, get_ops_table
+from .presets import FACE_PRESETS, compile_preset
 from .validators import clamp_value, validate_feature_name, normalize_direction
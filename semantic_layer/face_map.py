@@ -528,6 +528,35 @@ def get_operations_for_feature(feature_name, rig_type="generic"):
     return resolved_ops
 
 
+_AXIS_INDEX = {"X": 0, "Y": 1, "Z": 2}
+_OPS_TABLES = {}  # rig_type -> {feature_name: resolved operations}
+
+
+def get_ops_table(rig_type="generic"):
+    """Get resolved operations for every feature at once, built once per rig type.
+
+    Each operation also carries "axis_idx" (0/1/2 for X/Y/Z). The table
+    and its operation dicts are shared between callers, so treat them as
+    read-only.
+
+    Args:
+        rig_type: "metahuman", "rigify", or "generic".
+
+    Returns:
+        dict mapping feature_name -> list of resolved operation dicts.
+    """
+    table = _OPS_TABLES.get(rig_type)
+    if table is None:
+        table = {}
+        for feature_name in FACIAL_FEATURE_MAP:
+            operations = get_operations_for_feature(feature_name, rig_type)
+            for op in operations:
+                op["axis_idx"] = _AXIS_INDEX.get(op["axis"], 0)
+            table[feature_name] = operations
+        _OPS_TABLES[rig_type] = table
+    return table
+
+
 def get_all_features():
     """Return a summary of all available facial features.
 
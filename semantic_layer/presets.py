@@ -4,6 +4,9 @@ Face Presets — predefined combinations of facial feature values.
 Each preset maps feature names to values in the [-1.0, 1.0] range.
 """
 
+from functools import lru_cache
+
+from .face_map import get_ops_table
 
 FACE_PRESETS = {
     # --- FACE SHAPE PRESETS ---
@@ -239,6 +242,36 @@ def get_preset(name):
     return FACE_PRESETS.get(name)
 
 
+@lru_cache(maxsize=None)
+def compile_preset(name, rig_type="generic"):
+    """Resolve a preset's bone operations for a rig, once per (preset, rig).
+
+    Args:
+        name: Preset name.
+        rig_type: "metahuman", "rigify", or "generic".
+
+    Returns:
+        tuple of (feature_name, value, operations) with operations as
+        (bone, transform, axis, multiplier) tuples, or None if not found.
+    """
+    preset = FACE_PRESETS.get(name)
+    if not preset:
+        return None
+
+    ops_table = get_ops_table(rig_type)
+    return tuple(
+        (
+            feature_name,
+            value,
+            tuple(
+                (op["bone"], op["transform"], op["axis"], op["multiplier"])
+                for op in ops_table.get(feature_name, ())
+            ),
+        )
+        for feature_name, value in preset["features"].items()
+    )
+
+
 def list_presets():
     """List all available presets with descriptions.
 
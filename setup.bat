@@ -16,7 +16,7 @@ if errorlevel 1 (
 REM Activate and install dependencies
 echo [2/3] Installing dependencies...
 call venv\Scripts\activate.bat
-pip install -r requirements.txt
+pip install -e .
 if errorlevel 1 (
     echo ERROR: Failed to install dependencies.
     pause
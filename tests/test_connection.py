@@ -12,9 +12,11 @@ import socket
 import threading
 import json
 import time
+import asyncio
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from mcp_server import blender_connection
 from mcp_server.blender_connection import BlenderConnection
 
 
@@ -28,6 +30,7 @@ class MockBlenderServer:
         self._running = False
         self.received_commands = []
         self.response_override = None
+        self.keep_alive = False  # Answer every line instead of closing after one
 
     def start(self):
         self._running = True
@@ -58,28 +61,37 @@ class MockBlenderServer:
 
     def _handle_client(self, client):
         client.settimeout(5.0)
+        buffer = ""
         try:
-            data = client.recv(65536).decode("utf-8")
-            if "\n" in data:
-                message = data.split("\n")[0]
-                request = json.loads(message)
-                self.received_commands.append(request)
-
-                if self.response_override:
-                    response = self.response_override
-                else:
-                    response = {
-                        "id": request.get("id"),
-                        "status": "success",
-                        "result": {"echo": request.get("command")}
-                    }
-
-                client.sendall((json.dumps(response) + "\n").encode("utf-8"))
+            while True:
+                data = client.recv(65536).decode("utf-8")
+                if not data:
+                    break
+                buffer += data
+                while "\n" in buffer:
+                    message, buffer = buffer.split("\n", 1)
+                    self._reply(client, json.loads(message))
+                    if not self.keep_alive:
+                        return
         except Exception:
             pass
         finally:
             client.close()
 
+    def _reply(self, client, request):
+        self.received_commands.append(request)
+
+        if self.response_override:
+            response = self.response_override
+        else:
+            response = {
+                "id": request.get("id"),
+                "status": "success",
+                "result": {"echo": request.get("command")}
+            }
+
+        client.sendall((json.dumps(response) + "\n").encode("utf-8"))
+
 
 class TestBlenderConnection(unittest.TestCase):
 
@@ -98,6 +110,7 @@ class TestBlenderConnection(unittest.TestCase):
         self.mock_server = self.__class__.mock_server
         self.mock_server.received_commands.clear()
         self.mock_server.response_override = None
+        self.mock_server.keep_alive = False
 
     def tearDown(self):
         self.conn.disconnect()
@@ -114,6 +127,71 @@ class TestBlenderConnection(unittest.TestCase):
         self.assertEqual(cmd["command"], "move_bone")
         self.assertEqual(cmd["params"]["bone_name"], "test")
 
+    def test_send_command_async(self):
+        self.mock_server.keep_alive = True
+
+        async def run():
+            return await asyncio.gather(
+                self.conn.send_command_async("ping"),
+                self.conn.send_command_async("list_bones", {"names_only": True}),
+            )
+
+        results = asyncio.run(run())
+        self.assertEqual([r["result"]["echo"] for r in results], ["ping", "list_bones"])
+
+    def test_reconnects_after_server_closes(self):
+        # The mock server closes each connection after one reply, so the
+        # second command finds a stale socket and must reconnect
+        self.conn._retry_delay = 5.0
+        start = time.monotonic()
+        first = self.conn.send_command("ping")
+        second = self.conn.send_command("ping")
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(second["status"], "success")
+        self.assertLess(time.monotonic() - start, 2.0)
+
+    def test_send_batch(self):
+        self.mock_server.keep_alive = True
+        results = self.conn.send_batch([
+            ("move_bone", {"bone_name": "a"}),
+            ("rotate_bone", {"bone_name": "b"}),
+            ("ping", None),
+        ])
+        self.assertEqual([r["result"]["echo"] for r in results], ["move_bone", "rotate_bone", "ping"])
+        ids = [cmd["id"] for cmd in self.mock_server.received_commands]
+        self.assertEqual([r["id"] for r in results], ids)
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_heartbeat_pings_idle_connection(self):
+        self.mock_server.keep_alive = True
+        original = blender_connection.HEARTBEAT_INTERVAL
+        blender_connection.HEARTBEAT_INTERVAL = 0.1
+        try:
+            self.conn.send_command("move_bone", {"bone_name": "a"})
+            time.sleep(0.5)
+        finally:
+            blender_connection.HEARTBEAT_INTERVAL = original
+        commands = [cmd["command"] for cmd in self.mock_server.received_commands]
+        self.assertEqual(commands[0], "move_bone")
+        self.assertIn("ping", commands[1:])
+        # The connection is still usable after the heartbeats
+        self.assertEqual(self.conn.send_command("ping")["status"], "success")
+
+    def test_rig_cached_until_invalidated(self):
+        self.mock_server.keep_alive = True
+        self.mock_server.response_override = {
+            "id": None,
+            "status": "success",
+            "result": {"names": ["FACIAL_C_Jaw", "FACIAL_L_Eye"], "locations": [[0, 0, 0]] * 2}
+        }
+        self.assertEqual(self.conn.get_rig(), ("metahuman", None))
+        self.assertEqual(self.conn.get_rig(), ("metahuman", None))
+        self.assertEqual(len(self.mock_server.received_commands), 1)
+
+        self.conn.invalidate_bones_cache()
+        self.conn.get_rig()
+        self.assertEqual(len(self.mock_server.received_commands), 2)
+
     def test_connection_refused(self):
         bad_conn = BlenderConnection(host="127.0.0.1", port=19999)
         bad_conn._max_retries = 1
@@ -19,8 +19,10 @@ from face_reconstruction.reference_proportions import (
     MEASUREMENT_CONFIDENCE,
 )
 from face_reconstruction.feature_mapper import (
+    FEATURE_NAMES,
     PROPORTION_TO_FEATURE,
     map_proportions_to_features,
+    map_proportions_to_feature_array,
     get_feature_confidence,
     get_top_distinctive_features,
     format_features_by_category,
@@ -178,6 +180,14 @@ class TestFeatureMapper(unittest.TestCase):
         features = map_proportions_to_features({})
         self.assertEqual(len(features), 32)
 
+    def test_feature_array_matches_dict(self):
+        """The array form should hold the dict values in FEATURE_NAMES order."""
+        proportions = {k: mean * 1.1 for k, (mean, std) in REFERENCE_PROPORTIONS.items()}
+        values = map_proportions_to_feature_array(proportions)
+        features = map_proportions_to_features(proportions)
+        self.assertEqual(list(features), list(FEATURE_NAMES))
+        self.assertEqual(values.tolist(), list(features.values()))
+
     def test_ratio_to_feature_value_basic(self):
         """Test the core mapping function directly."""
         # At mean: should be 0
@@ -273,6 +283,18 @@ class TestProportionAnalyzer(unittest.TestCase):
         # Eye tilt should be near zero for symmetric face
         self.assertAlmostEqual(result.get("eye_tilt_ratio", 0), 0.0, places=2)
 
+    def test_array_input_matches_list_input(self):
+        """An (N, 3) array should give the same ratios as a list of tuples."""
+        import numpy as np
+
+        landmarks = _create_synthetic_face()
+        from_list = analyze_proportions(landmarks)
+        from_array = analyze_proportions(np.array(landmarks, dtype=np.float32))
+
+        self.assertEqual(set(from_list), set(from_array))
+        for key, value in from_list.items():
+            self.assertAlmostEqual(from_array[key], value, places=4, msg=key)
+
 
 class TestFormatOutput(unittest.TestCase):
     """Test output formatting functions."""
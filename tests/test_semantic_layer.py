@@ -14,11 +14,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from semantic_layer.face_map import (
     FACIAL_FEATURE_MAP, BONE_ALIAS_MAPS, detect_rig_type,
-    resolve_bone_name, get_operations_for_feature,
+    resolve_bone_name, get_operations_for_feature, get_ops_table,
     get_all_features, get_features_by_category
 )
 from semantic_layer.presets import (
-    FACE_PRESETS, get_preset, list_presets, blend_presets
+    FACE_PRESETS, get_preset, list_presets, blend_presets, compile_preset
 )
 from semantic_layer.validators import (
     clamp_value, validate_feature_name, normalize_direction,
@@ -97,6 +97,18 @@ class TestFaceMap(unittest.TestCase):
         ops = get_operations_for_feature("nonexistent_feature", "generic")
         self.assertEqual(ops, [])
 
+    def test_ops_table_matches_per_feature_lookup(self):
+        table = get_ops_table("metahuman")
+        self.assertIs(table, get_ops_table("metahuman"))
+        self.assertEqual(set(table), set(FACIAL_FEATURE_MAP))
+        for feature_name, ops in table.items():
+            for op in ops:
+                self.assertEqual(op["axis_idx"], "XYZ".index(op["axis"]))
+            self.assertEqual(
+                [{k: v for k, v in op.items() if k != "axis_idx"} for op in ops],
+                get_operations_for_feature(feature_name, "metahuman")
+            )
+
     def test_get_all_features(self):
         features = get_all_features()
         self.assertGreater(len(features), 20)
@@ -143,6 +155,18 @@ class TestPresets(unittest.TestCase):
     def test_get_preset_missing(self):
         self.assertIsNone(get_preset("nonexistent"))
 
+    def test_compile_preset(self):
+        compiled = compile_preset("angular_face", "metahuman")
+        self.assertIs(compiled, compile_preset("angular_face", "metahuman"))
+        table = get_ops_table("metahuman")
+        for feature_name, value, operations in compiled:
+            self.assertEqual(value, FACE_PRESETS["angular_face"]["features"][feature_name])
+            self.assertEqual(
+                list(operations),
+                [(op["bone"], op["transform"], op["axis"], op["multiplier"]) for op in table[feature_name]]
+            )
+        self.assertIsNone(compile_preset("nonexistent_preset", "metahuman"))
+
     def test_list_presets(self):
         presets = list_presets()
         self.assertGreater(len(presets), 10)
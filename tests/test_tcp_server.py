@@ -0,0 +1,109 @@
+"""
+Tests for the addon's selector-based TCP server.
+
+tcp_server.py only uses the standard library, so it is loaded straight
+from its file (the blender_addon package itself imports bpy) and driven
+with a stand-in command router.
+"""
+
+import os
+import importlib.util
+import json
+import socket
+import time
+import unittest
+from collections import Counter
+
+_TCP_SERVER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "blender_addon", "tcp_server.py"
+)
+_spec = importlib.util.spec_from_file_location("tcp_server", _TCP_SERVER_PATH)
+tcp_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tcp_server)
+
+
+class EchoRouter:
+    """Answers every command immediately with its own name, counting calls."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def is_direct(self, command_name):
+        return command_name == "ping"
+
+    def submit(self, command_name, params, callback):
+        self.calls[command_name] += 1
+        callback({"status": "success", "result": {"echo": command_name}})
+
+    def submit_batch(self, commands, callback):
+        self.calls.update(name for name, _ in commands)
+        callback([{"status": "success", "result": {"echo": name}} for name, _ in commands])
+
+
+class TestTCPServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.router = EchoRouter()
+        cls.server = tcp_server.MCPTCPServer(port=19877, command_router=cls.router)
+        cls.server.start()
+        time.sleep(0.3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def _connect(self):
+        sock = socket.create_connection(("127.0.0.1", 19877), timeout=5.0)
+        self.addCleanup(sock.close)
+        return sock, sock.makefile("rb")
+
+    def _request(self, sock, reader, frame):
+        sock.sendall(frame.encode("utf-8") + b"\n")
+        return json.loads(reader.readline())
+
+    def test_ping(self):
+        sock, reader = self._connect()
+        response = self._request(sock, reader, '{"id": 1, "command": "ping"}')
+        self.assertEqual(response["result"]["echo"], "ping")
+
+    def test_malformed_frames_only_affect_their_client(self):
+        bad_sock, bad_reader = self._connect()
+        good_sock, good_reader = self._connect()
+
+        for frame in ('{"command": [1]}', '{"commands": [1]}', '{"commands": [{"command": "a", "params": 1}]}'):
+            response = self._request(bad_sock, bad_reader, frame)
+            self.assertEqual(response["status"], "error")
+
+        # The server is still up for other clients and for the sender
+        response = self._request(good_sock, good_reader, '{"id": 2, "command": "ping"}')
+        self.assertEqual(response["result"]["echo"], "ping")
+        response = self._request(bad_sock, bad_reader, '{"id": 3, "commands": [{"command": "ping"}]}')
+        self.assertEqual(response["results"][0]["result"]["echo"], "ping")
+
+    def test_response_cache(self):
+        sock, reader = self._connect()
+        self.server.invalidate_response_cache()
+        calls = self.router.calls
+        list_bones = '{"id": 1, "command": "list_bones", "params": {"filter": "FACIAL_*"}}'
+
+        def list_bones_calls():
+            response = self._request(sock, reader, list_bones)
+            self.assertEqual(response["result"]["echo"], "list_bones")
+            return calls["list_bones"]
+
+        first = list_bones_calls()
+        self.assertEqual(list_bones_calls(), first)  # Served from the cache
+
+        # Direct and read-only commands keep the cache
+        self._request(sock, reader, '{"id": 2, "command": "ping"}')
+        self._request(sock, reader, '{"id": 3, "commands": [{"command": "poll_export_status"}]}')
+        self.assertEqual(list_bones_calls(), first)
+
+        # A command that may change the scene drops it
+        self._request(sock, reader, '{"id": 4, "command": "move_bone", "params": {"bone_name": "a"}}')
+        self.assertEqual(list_bones_calls(), first + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()